@@ -0,0 +1,314 @@
+"""
+Time every detector of make_plugin() and every checklist printer on generated Solidity contracts of growing size.
+
+A fixture has N contracts of M functions, each function with nested loops, external calls in the loops
+and several modifiers, and each contract at the end of an inheritance chain.
+For every fixture the report gives per detector the wall time, the CFG nodes analyzed per second and the peak
+memory allocated while it runs. With several sizes, `exponent` is the slope of log(time) over log(nodes):
+around 1 the detector scales linearly, clearly above 1 it scales superlinearly.
+
+    python benchmarks/detectors.py --contracts 1,4,16 --functions 8 --loop-depth 2 --output detectors.json
+    python benchmarks/detectors.py --target path/to/project
+
+The fixtures are compiled with the solc found by crytic-compile, see --solc.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import product
+
+from slither import Slither
+
+import slither_my_plugin
+from slither_my_plugin.printers.inspex_checklist import STANDARD_ISSUES
+
+# Above this exponent a detector is reported as superlinear
+SUPERLINEAR = 1.3
+
+
+def generate_fixture(contracts: int, functions: int, loop_depth: int, modifiers: int, inheritance: int) -> str:
+    lines = [
+        "// SPDX-License-Identifier: MIT",
+        "pragma solidity ^0.8.0;",
+        "",
+        "interface IToken {",
+        "    function transfer(address to, uint256 amount) external returns (bool);",
+        "    function approve(address spender, uint256 amount) external returns (bool);",
+        "    function balanceOf(address account) external view returns (uint256);",
+        "}",
+        "",
+    ]
+    for c in range(contracts):
+        parent = None
+        for level in range(inheritance):
+            name = f"Base{c}_{level}"
+            lines.append(f"contract {name}" + (f" is {parent} {{" if parent else " {"))
+            lines += [
+                f"    address public owner{level};",
+                f"    uint256 internal counter{level};",
+                f"    modifier only{level}() {{ require(msg.sender == owner{level}); _; }}",
+                f"    function setOwner{level}(address a) external only{level} {{ owner{level} = a; }}",
+                "}",
+                "",
+            ]
+            parent = name
+        lines.append(f"contract Bench{c}" + (f" is {parent} {{" if parent else " {"))
+        lines += [
+            "    uint256[] public items;",
+            "    mapping(address => uint256) public balances;",
+            "    address public admin;",
+            "    event Updated(uint256 value);",
+        ]
+        for m in range(modifiers):
+            lines.append(f"    modifier check{m}(uint256 v) {{ require(v > {m}); _; }}")
+        for f in range(functions):
+            used = " ".join(f"check{m}(n)" for m in range(modifiers))
+            lines.append(f"    function run{f}(uint256 n, address to, IToken t) external {used} {{")
+            indent = "        "
+            for depth in range(loop_depth):
+                bound = "items.length" if depth == 0 else "n"
+                lines.append(f"{indent}for (uint256 i{depth} = 0; i{depth} < {bound}; i{depth}++) {{")
+                indent += "    "
+            if loop_depth > 0:
+                last = f"i{loop_depth - 1}"
+                lines += [
+                    f"{indent}if ({last} == 3) continue;",
+                    f"{indent}balances[to] += items[i0] * {last} / 3;",
+                    f"{indent}t.transfer(to, {last});",
+                ]
+            for depth in reversed(range(loop_depth)):
+                indent = indent[:-4]
+                lines.append(f"{indent}}}")
+            lines += [
+                "        if (address(this).balance == n) { emit Updated(n); }",
+                "        t.approve(to, uint8(n));",
+                f"        _helper{f}(n);",
+                "        admin = to;",
+                "    }",
+                f"    function _helper{f}(uint256 n) internal {{ items.push(n); }}",
+            ]
+        lines += ["}", ""]
+    return "\n".join(lines)
+
+
+def count_nodes(slither: Slither) -> int:
+    return sum(
+        len(f.nodes)
+        for cu in slither.compilation_units
+        for f in list(cu.functions_and_modifiers) + list(cu.functions_top_level)
+    )
+
+
+def checklist_arguments():
+    return {arg for standard in STANDARD_ISSUES for testing in standard[1:] for issue in testing[1:] for arg in issue[1]}
+
+
+def load(target: str, solc):
+    kwargs = {} if solc is None else {"solc": solc}
+    start = time.perf_counter()
+    slither = Slither(target, **kwargs)
+    return slither, time.perf_counter() - start
+
+
+def register(slither: Slither, printers: bool):
+    detectors, plugin_printers = slither_my_plugin.make_plugin()
+    for d in detectors:
+        slither.register_detector(d)
+    plugin = list(slither.detectors)
+    upstream = []
+    if printers:
+        # The checklist also reads upstream detectors, registered as the slither command line does
+        from slither.__main__ import get_detectors_and_printers
+        have = {d.ARGUMENT for d in plugin}
+        arguments = checklist_arguments()
+        for d in get_detectors_and_printers()[0]:
+            if d.ARGUMENT not in have and d.ARGUMENT in arguments:
+                slither.register_detector(d)
+        upstream = [d for d in slither.detectors if d not in plugin]
+    for d in slither.detectors:
+        d.logger = None
+    if not printers:
+        return plugin, upstream, []
+    # One instance per compilation unit, as register_printer() does
+    return plugin, upstream, [[p(cu, slither, None) for cu in slither.compilation_units] for p in plugin_printers]
+
+
+def run_detector(detector):
+    try:
+        return len(detector.detect()), None
+    except Exception as e: # A failing detector is reported, the others are still measured
+        return None, f"{type(e).__name__}: {e}"
+
+
+def time_detectors(target: str, solc, workdir: str):
+    slither, compile_time = load(target, solc)
+    nodes = count_nodes(slither)
+    plugin, upstream, plugin_printers = register(slither, printers=True)
+    detectors = {}
+    for d in plugin:
+        start = time.perf_counter()
+        findings, error = run_detector(d)
+        elapsed = time.perf_counter() - start
+        detectors[d.ARGUMENT] = {
+            "time_s": elapsed,
+            "nodes_per_s": nodes / elapsed if elapsed > 0 else None,
+            "findings": findings,
+            "error": error,
+        }
+
+    # Run before the printers so their time is the rendering only
+    start = time.perf_counter()
+    for d in upstream:
+        run_detector(d)
+    upstream_time = time.perf_counter() - start
+
+    printers = {}
+    cwd = os.getcwd()
+    os.chdir(workdir) # The printers write their files in the current directory
+    try:
+        for instances in plugin_printers:
+            start = time.perf_counter()
+            error = None
+            try:
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    for p in instances:
+                        p.output(target)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            printers[instances[0].ARGUMENT] = {"time_s": time.perf_counter() - start, "error": error}
+    finally:
+        os.chdir(cwd)
+    return {
+        "compile_s": compile_time,
+        "nodes": nodes,
+        "upstream_detectors_s": upstream_time,
+        "detectors": detectors,
+        "printers": printers,
+    }
+
+
+def measure_memory(target: str, solc):
+    """ Peak memory allocated by each detector, on a separate load since tracemalloc slows everything down """
+    slither, _ = load(target, solc)
+    plugin, _, _ = register(slither, printers=False)
+    peaks = {}
+    tracemalloc.start()
+    try:
+        for d in plugin:
+            gc.collect()
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            else: # Python < 3.9, a new trace starts from zero
+                tracemalloc.stop()
+                tracemalloc.start()
+            current = tracemalloc.get_traced_memory()[0]
+            run_detector(d)
+            peaks[d.ARGUMENT] = tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def benchmark(target: str, solc, workdir: str):
+    result = time_detectors(target, solc, workdir)
+    for argument, peak in measure_memory(target, solc).items():
+        result["detectors"][argument]["peak_memory_kb"] = peak / 1024
+    return result
+
+
+def scaling_exponent(points):
+    """ Least squares slope of log(time) over log(nodes) """
+    points = [(math.log(n), math.log(t)) for n, t in points if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    mx = sum(x for x, _ in points) / len(points)
+    my = sum(y for _, y in points) / len(points)
+    var = sum((x - mx) ** 2 for x, _ in points)
+    if var == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in points) / var
+
+
+def scaling(runs):
+    res = {}
+    for kind in ["detectors", "printers"]:
+        names = sorted({name for run in runs for name in run[kind]})
+        for name in names:
+            points = [(run["nodes"], run[kind][name]["time_s"]) for run in runs if name in run[kind]]
+            exponent = scaling_exponent(points)
+            res[name] = {
+                "exponent": exponent,
+                "superlinear": exponent is not None and exponent > SUPERLINEAR,
+            }
+    return res
+
+
+def int_list(value: str):
+    return [int(v) for v in value.split(",") if v.strip() != ""]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Inspex detectors and checklist printers.")
+    parser.add_argument("--contracts", type=int_list, default=[1, 4, 16], help="Comma separated contract counts")
+    parser.add_argument("--functions", type=int_list, default=[8], help="Comma separated functions per contract")
+    parser.add_argument("--loop-depth", type=int, default=2, help="Nested loops in every function")
+    parser.add_argument("--modifiers", type=int, default=2, help="Modifiers applied to every function")
+    parser.add_argument("--inheritance", type=int, default=2, help="Parents of every contract")
+    parser.add_argument("--target", action="append", help="Benchmark an existing project instead of the fixtures")
+    parser.add_argument("--solc", help="solc binary used to compile")
+    parser.add_argument("--keep", help="Directory where the generated fixtures are kept")
+    parser.add_argument("--output", help="File the JSON report is written to, stdout by default")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = []
+        if args.target:
+            fixtures = [({"target": t}, os.path.abspath(t)) for t in args.target]
+        else:
+            directory = args.keep or tmp
+            os.makedirs(directory, exist_ok=True)
+            for contracts, functions in product(args.contracts, args.functions):
+                params = {
+                    "contracts": contracts,
+                    "functions": functions,
+                    "loop_depth": args.loop_depth,
+                    "modifiers": args.modifiers,
+                    "inheritance": args.inheritance,
+                }
+                path = os.path.join(directory, "Bench_%d_%d.sol" % (contracts, functions))
+                with open(path, "w", encoding="utf8") as f:
+                    f.write(generate_fixture(**params))
+                fixtures.append((params, path))
+
+        runs = []
+        for params, path in fixtures:
+            print("Benchmarking %s" % path, file=sys.stderr)
+            run = benchmark(path, args.solc, tmp)
+            run["fixture"] = params
+            runs.append(run)
+
+    report = {"python": sys.version.split()[0], "runs": runs}
+    if len(runs) > 1:
+        report["scaling"] = scaling(runs)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for name, s in report.get("scaling", {}).items():
+        if s["superlinear"]:
+            print("%s scales superlinearly, exponent %.2f" % (name, s["exponent"]), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
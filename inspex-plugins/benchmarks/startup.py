@@ -0,0 +1,153 @@
+"""
+Startup cost of the plugin: import time of slither_my_plugin, of its modules and of xlsxwriter, and make_plugin() latency.
+
+Every measure runs in a new interpreter. The slither modules loaded before the plugins are imported first,
+so the times are the ones the plugin adds to a slither run.
+`cold` compiles the sources again (empty bytecode cache), `warm` reads the existing .pyc files.
+
+    python benchmarks/startup.py --runs 10 --output startup.json
+    python benchmarks/startup.py --baseline startup.json --max-regression 20
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Run in the child interpreter, prints the measures as JSON
+PROBE = """
+import json, time
+import slither.slither, slither.detectors.all_detectors, slither.printers.all_printers
+start = time.perf_counter()
+import slither_my_plugin
+imported = time.perf_counter()
+detectors, printers = slither_my_plugin.make_plugin()
+made = time.perf_counter()
+try:
+    import xlsxwriter
+    xlsx = (time.perf_counter() - made) * 1000
+except ImportError:
+    xlsx = None
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "make_plugin_ms": (made - imported) * 1000,
+    "xlsxwriter_ms": xlsx,
+    "detectors": len(detectors),
+    "printers": len(printers),
+}))
+"""
+
+# Changes smaller than this are noise, whatever their percentage
+NOISE_MS = 1.0
+
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_probe(cold: bool, importtime: bool = False):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([PLUGIN_ROOT] + [p for p in [env.get("PYTHONPATH")] if p])
+    args = [sys.executable]
+    if importtime:
+        args += ["-X", "importtime"]
+    with tempfile.TemporaryDirectory() as cache:
+        if cold: # Bytecode of every module compiled again and written aside
+            env["PYTHONPYCACHEPREFIX"] = cache
+        out = subprocess.run(args + ["-c", PROBE], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1]), out.stderr
+
+
+def parse_importtime(stderr: str, prefixes):
+    """ Self and cumulative time in ms of the modules starting with one of the prefixes, from -X importtime """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue # Header line
+        name = fields[2].strip()
+        if any(name == p or name.startswith(p + ".") for p in prefixes):
+            modules[name] = {"self_ms": int(fields[0]) / 1000, "cumulative_ms": int(fields[1]) / 1000}
+    return modules
+
+
+def summarize(samples, key):
+    values = [s[key] for s in samples if s[key] is not None]
+    if not values:
+        return None
+    return {"median": statistics.median(values), "min": min(values), "max": max(values)}
+
+
+def measure(runs: int):
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+    }
+    try:
+        from importlib import metadata
+        report["slither"] = metadata.version("slither-analyzer")
+    except Exception:
+        report["slither"] = None
+
+    first, _ = run_probe(cold=False) # Also fills the bytecode cache for the warm runs
+    report["detectors"] = first["detectors"]
+    report["printers"] = first["printers"]
+    for mode in ["cold", "warm"]:
+        samples = [run_probe(cold=mode == "cold")[0] for _ in range(runs)]
+        report[mode] = {key: summarize(samples, key) for key in ["import_ms", "make_plugin_ms", "xlsxwriter_ms"]}
+
+    _, stderr = run_probe(cold=False, importtime=True)
+    modules = parse_importtime(stderr, ["slither_my_plugin", "xlsxwriter"])
+    report["modules"] = dict(sorted(modules.items(), key=lambda m: -m[1]["cumulative_ms"]))
+    return report
+
+
+def compare(report, baseline, max_regression: float):
+    """ Lines describing the changes of the median times, and whether one grew more than max_regression percent """
+    lines = []
+    failed = False
+    for mode in ["cold", "warm"]:
+        for key, current in report[mode].items():
+            previous = baseline.get(mode, {}).get(key)
+            if current is None or previous is None or previous["median"] == 0:
+                continue
+            change = (current["median"] - previous["median"]) / previous["median"] * 100
+            regressed = change > max_regression and current["median"] - previous["median"] > NOISE_MS
+            failed |= regressed
+            lines.append("%s %s: %.2f ms -> %.2f ms (%+.1f%%)%s" % (
+                mode, key, previous["median"], current["median"], change, " REGRESSION" if regressed else ""
+            ))
+    return lines, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the startup cost of the Inspex slither plugin.")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters started per mode")
+    parser.add_argument("--output", help="File the JSON report is written to, stdout by default")
+    parser.add_argument("--baseline", help="Report of a previous version to compare with")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="Allowed growth of a median time, in percent")
+    args = parser.parse_args()
+
+    report = measure(args.runs)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf8") as f:
+            lines, failed = compare(report, json.load(f), args.max_regression)
+        for line in lines:
+            print(line, file=sys.stderr)
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
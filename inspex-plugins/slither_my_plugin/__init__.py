@@ -19,7 +19,7 @@ from slither_my_plugin.detectors.dirty_iterators import DirtyIterators
 from slither_my_plugin.detectors.unsafe_initiate import UnsafeInitiate
 from slither_my_plugin.detectors.standard_token_check import StandardTokenCheck
 
-from slither_my_plugin.printers.inspex_checklist import InspexTestingGuideChecklist, InspexTestingGuideChecklistCSV, InspexTestingGuideChecklistXLS
+from slither_my_plugin.printers.inspex_checklist import InspexTestingGuideChecklist, InspexTestingGuideChecklistCSV, InspexTestingGuideChecklistXLS, InspexTestingGuideChecklistAll
 
 def make_plugin():
     plugin_detectors = [
@@ -48,7 +48,8 @@ def make_plugin():
     plugin_printers = [
         InspexTestingGuideChecklist,
         InspexTestingGuideChecklistCSV,
-        InspexTestingGuideChecklistXLS
+        InspexTestingGuideChecklistXLS,
+        InspexTestingGuideChecklistAll
     ]
 
 
@@ -3,16 +3,21 @@ from typing import List
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
 from slither.core.declarations import Contract
 from slither.utils.output import Output
+from slither.core.expressions import MemberAccess
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
+from slither_my_plugin.utils.analysis_index import get_analysis_index
+from slither_my_plugin.utils.expression_matcher import references_variable
 
 
-class ApproveUnknownAddress(AbstractDetector, SummaryTable):
+class ApproveUnknownAddress(CachedDetector, AbstractDetector, SummaryTable):
 
     ARGUMENT = "approve-unknown-address"
     HELP = "Approve or Transfer to unknown address"
 
     IMPACT = DetectorClassification.LOW
     CONFIDENCE = DetectorClassification.LOW
+    PER_CONTRACT = True
 
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/6-external-components#6.2.-funds-should-not-be-approved-or-transferred-to-unknown-accounts"
 
@@ -65,26 +70,23 @@ contract UnsafeVault2 {
 
     def findApprove(self, contract: Contract):
         res = []
+        index = get_analysis_index(self.compilation_unit)
 
         for f in contract.functions:
             if f.view or f.pure:
                 continue
             if f.is_implemented and f.name != 'constructor':
-                for node in f.nodes:
-                    if len(node.external_calls_as_expressions) > 0:
-                        ext = node.external_calls_as_expressions[0]
-                        if 'member_name' in ext.called.__dict__:
-                            if ext.called.member_name == 'approve':
-                                for arg in ext.arguments:
-                                    for p in f.parameters:
-                                        if str(p) in str(arg):
-                                            res.append(node)
+                for node in index.function(f).external_call_nodes:
+                    ext = node.external_calls_as_expressions[0]
+                    if isinstance(ext.called, MemberAccess) and ext.called.member_name == 'approve':
+                        if any(references_variable(arg, p) for arg in ext.arguments for p in f.parameters):
+                            res.append(node)
         return res
 
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.compilation_unit.contracts_derived:
+        for c in self.targetContracts(self.compilation_unit.contracts_derived):
             values = self.findApprove(c)
             if len(values) == 0:
                 continue
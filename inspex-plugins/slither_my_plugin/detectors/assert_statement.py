@@ -1,19 +1,23 @@
-from pprint import pprint
 from typing import List
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
 from slither.core.declarations import Contract
 from slither.utils.output import Output
-from slither_my_plugin.utils.table_generator import markdownTableFromSlitherResult
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.utils.analysis_index import get_analysis_index
+from slither_my_plugin.utils.expression_matcher import calls_solidity_function
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
 
-class AssertStatement(AbstractDetector, SummaryTable):
+class AssertStatement(CachedDetector, AbstractDetector, SummaryTable):
 
     ARGUMENT = "assert-statement"
     HELP = "Using of Improper Statement Validator"
 
     IMPACT = DetectorClassification.OPTIMIZATION
     CONFIDENCE = DetectorClassification.HIGH
+    PER_CONTRACT = True
+
+    TABLE_HEADER = ["File", "Contract"]
 
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/9-best-practices#9.6.-assert-statement-should-not-be-used-for-validating-common-conditions"
 
@@ -34,7 +38,7 @@ function withdraw(uint256 amount) external {
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.contracts:
+        for c in self.targetContracts(self.contracts):
             res = self.findAssert(c)
             if res != []:
                 results.append(self.generate_result(res))
@@ -42,49 +46,11 @@ function withdraw(uint256 amount) external {
 
     def findAssert(self, contract: Contract):
         res = []
+        index = get_analysis_index(self.compilation_unit)
         for f in contract.functions:
-            for n in f.nodes:
-                if n.expression and "assert" in str(n.expression):
+            for n in index.function(f).require_or_assert_nodes:
+                if calls_solidity_function(n.expression, "assert"):
                     if res == []:
                         res = ["Found assert statement in ", f, ":\n"]
                     res += ["\t- ", n, "\n"]
         return res
-
-    def _toTable(self):
-        """"
-        example:
-        | File | Contract | Function |
-        ------------------------------
-        """
-        ### ---------------edit here---------------
-        header = ["File", "Contract"]
-        ### ---------------------------------------
-        
-        try:
-            table = [header]
-            column_max_len = [len(h) for h in header]
-            detect_results = self._detect()
-            for r in detect_results:
-                row = []
-                for e in r.elements:
-                    # pprint(e)
-                    ### ---------------edit here---------------
-                    ### Get data from object
-                    line = e['source_mapping']['lines'][0]
-                    file = "%s (L:%s)" % (e["source_mapping"]["filename_short"].split("/")[-1], line)
-                    contract = e["type_specific_fields"]["parent"]["name"]
-                    # function = e["name"] + "()"
-                    ### Map to row
-                    row.append(file)
-                    row.append(contract)
-                    # row.append(function)
-                    ### ---------------------------------------
-                    ### Check max len
-                    for i in range(len(row)):
-                        column_max_len[i] = column_max_len[i] if column_max_len[i] > len(row[i]) else len(row[i])
-                    table.append(row)
-                    break
-            return markdownTableFromSlitherResult(table, column_max_len, header[0])
-        except Exception as e:
-            pprint(e)
-            return ""
\ No newline at end of file
@@ -1,20 +1,22 @@
 
-import pprint
 from typing import List
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
 from slither.core.declarations import Contract
 from slither.utils.output import Output
-from slither_my_plugin.utils.table_generator import markdownTableFromSlitherResult
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
 
-class AssignMemoryArray(AbstractDetector, SummaryTable):
+class AssignMemoryArray(CachedDetector, AbstractDetector, SummaryTable):
 
     ARGUMENT = "assign-memory-array"
     HELP = "Assign the value to the memory of array"
 
     IMPACT = DetectorClassification.HIGH
     CONFIDENCE = DetectorClassification.LOW
+    PER_CONTRACT = True
+
+    TABLE_HEADER = ["File", "Contract"]
 
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/5-blockchain-data#5.5.-modification-of-array-state-should-not-be-done-by-value"
 
@@ -62,7 +64,7 @@ contract Memory {
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.compilation_unit.contracts_derived:
+        for c in self.targetContracts(self.compilation_unit.contracts_derived):
             values = self.findMemoryArray(c)
             if len(values) == 0:
                 continue
@@ -73,41 +75,3 @@ contract Memory {
             results.append(res)
 
         return results
-
-    def _toTable(self):
-        """"
-        example:
-        | File | Contract | Function |
-        ------------------------------
-        """
-        ### ---------------edit here---------------
-        header = ["File", "Contract"]
-        ### ---------------------------------------
-        
-        try:
-            table = [header]
-            column_max_len = [len(h) for h in header]
-            detect_results = self._detect()
-            for r in detect_results:
-                row = []
-                for e in r.elements:
-                    ### ---------------edit here---------------
-                    ### Get data from object
-                    line = e['source_mapping']['lines'][0]
-                    file = "%s (L:%s)" % (e["source_mapping"]["filename_short"].split("/")[-1], line)
-                    contract = e["type_specific_fields"]["parent"]["name"]
-                    # function = e["name"] + "()"
-                    ### Map to row
-                    row.append(file)
-                    row.append(contract)
-                    # row.append(function)
-                    ### ---------------------------------------
-                    ### Check max len
-                    for i in range(len(row)):
-                        column_max_len[i] = column_max_len[i] if column_max_len[i] > len(row[i]) else len(row[i])
-                    table.append(row)
-                    break
-            return markdownTableFromSlitherResult(table, column_max_len, header[0])
-        except Exception as e:
-            pprint(e)
-            return ""
\ No newline at end of file
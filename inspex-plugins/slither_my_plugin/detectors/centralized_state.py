@@ -1,21 +1,25 @@
-from pprint import pprint
 from typing import List
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
 from slither.core.declarations import FunctionContract
 from slither.utils.output import Output
 from slither.core.expressions.call_expression import CallExpression
-from slither_my_plugin.utils.table_generator import markdownTableFromSlitherResult
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
 from slither_my_plugin.detectors.extends.privilege_list import PrivilegeList
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
+from slither_my_plugin.utils.expression_matcher import is_solidity_call, references_msg_sender
 
 
-class CentralizedState(AbstractDetector, SummaryTable, PrivilegeList):
+class CentralizedState(CachedDetector, AbstractDetector, SummaryTable, PrivilegeList):
 
     ARGUMENT = "centralized-state"
     HELP = "Centralized Control of State Variable"
 
     IMPACT = DetectorClassification.HIGH
     CONFIDENCE = DetectorClassification.MEDIUM
+    PER_CONTRACT = True
+
+    TABLE_HEADER = ["File", "Contract", "Function", "Modifier"]
+    TABLE_SORT = None # In the order of the results
 
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/1-architecture-and-design#1.5.-state-variables-should-not-be-unfairly-controlled-by-privileged-accounts"
 
@@ -54,14 +58,17 @@ contract Owner {
 
     WIKI_RECOMMENDATION = "Remove the functions with unnecessarily high privilege; Transfer the privilege to community-run smart contract governance or DAO. Mitigate the risk by using a timelock to delay the effect of the privileged functions by a sufficient amount of time, e.g. at least 24 hours."
 
+    def cacheSettings(self) -> str:
+        if 'isUsePrivilegeList' in self.__dict__ and self.isUsePrivilegeList:
+            return ",".join(sorted(self.modifiers))
+        return ""
+
     def is_required_msg_sender(self, expression: CallExpression):
-        if 'require' in str(expression.called) or 'assert' in str(expression.called):
-            expName = expression.called.value.name.split('(')[0]
-            if expName in ['require', 'assert'] and hasattr(expression.arguments[0], 'expressions'):
-                arg0 = expression.arguments[0].expressions[0]
-                arg1 = expression.arguments[0].expressions[1]
-                if 'sender' in str(arg0) or 'sender' in str(arg1):
-                    return True
+        if is_solidity_call(expression, 'require', 'assert') and hasattr(expression.arguments[0], 'expressions'):
+            arg0 = expression.arguments[0].expressions[0]
+            arg1 = expression.arguments[0].expressions[1]
+            if references_msg_sender(arg0) or references_msg_sender(arg1):
+                return True
         return False
 
     def is_centralized_modifier(self, modifier: FunctionContract):
@@ -110,58 +117,16 @@ contract Owner {
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.compilation_unit.contracts_derived:
+        for c in self.targetContracts(self.compilation_unit.contracts_derived):
             for f in c.functions_entry_points:
                 if f.view or f.pure:
                     continue
                 if self.isStateChanged(f):
                     (res, modifiers) = self.check_function(f)
                     if len(res) > 0:
-                        results.append(self.generate_result(res, additional_fields={"modifiers": modifiers}))
+                        # Keep the names only, the results have to be serializable
+                        results.append(self.generate_result(res, additional_fields={"modifiers": [m.name for m in modifiers]}))
 
         if len(results) > 0:
             results.insert(0, self.generate_result(["Centralized Control of State Variable \n"]))
         return results
-
-
-    def _toTable(self):
-        """"
-        example:
-        | File | Contract | Function |
-        ------------------------------
-        """
-        ### ---------------edit here---------------
-        header = ["File", "Contract", "Function",  "Modifier"]
-        ### ---------------------------------------
-        
-        try:
-            table = [header]
-            column_max_len = [len(h) for h in header]
-            detect_results = self._detect()
-            
-            for r in detect_results:
-                row = []
-                for e in r.elements:
-                    ### ---------------edit here---------------
-                    ### Get data from object
-                    line = e['source_mapping']['lines'][0]
-                    file = "%s (L:%s)" % (e["source_mapping"]["filename_short"].split("/")[-1], line)
-                    contract = e["type_specific_fields"]["parent"]["name"]
-                    function = e["name"] + "()"
-                    modifiers = ", ".join([m.name for m in r.data['additional_fields']['modifiers'] ])
-                    ### ---------------------------------------
-                    ### Map to row
-                    row.append(file)
-                    row.append(contract)
-                    row.append(function)
-                    row.append(modifiers)
-                    ### ---------------------------------------
-                    ### Check max len
-                    for i in range(len(row)):
-                        column_max_len[i] = column_max_len[i] if column_max_len[i] > len(row[i]) else len(row[i])
-                    table.append(row)
-                    break
-            return markdownTableFromSlitherResult(table, column_max_len)
-        except Exception as e:
-            pprint(e)
-            return ""
@@ -6,15 +6,19 @@ from slither.core.expressions.identifier import Identifier
 from slither.core.expressions.expression import Expression
 from slither.utils.output import Output
 from slither.core.cfg.node import Node, NodeType
+from slither_my_plugin.utils.analysis_index import get_analysis_index
+from slither_my_plugin.utils.loop_analysis import get_loop_forest, loop_bound_fields
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
 
-class DirtyIterators(AbstractDetector):
+class DirtyIterators(CachedDetector, AbstractDetector):
 
     ARGUMENT = "dirty-iterators"
     HELP = "Find loops that modifying its iterator"
 
     IMPACT = DetectorClassification.MEDIUM
     CONFIDENCE = DetectorClassification.LOW
+    PER_CONTRACT = True
 
     WIKI = "https://docs.inspex.co/smart-contract-security-testing-guide/testing-categories/8-testing-loop-operation#8.5.-inconsistent-loop-iterator"
 
@@ -44,42 +48,45 @@ contract Buggy {
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.contracts:
-            res = self.findLoop(c)
+        for c in self.targetContracts(self.contracts):
+            res, loops = self.findLoop(c)
             if res != []:
-                results.append(self.generate_result(res))
+                results.append(self.generate_result(res, additional_fields=loop_bound_fields(loops)))
             pass
         return results
 
     def findLoop(self, contract: Contract):
         res = []
+        loops = []
+        index = get_analysis_index(self.compilation_unit)
         for f in contract.functions:
+            if not index.function(f).has_loop():
+                continue
             n: Node
-            isInLoop = False
             iterators = []
-            for n in f.nodes:
-                if n._node_type == NodeType.IFLOOP: # Not work in nested loop case
-                    isInLoop = True
-                    if isinstance(n.expression, BinaryOperation) and hasattr(n.expression, '_expressions'):
-                        for ex in n.expression._expressions:
-                            if isinstance(ex, Identifier):
-                                iterators.append([ex._value,[]])
-
-                elif  hasattr(n.immediate_dominator, '_node_type') and n.immediate_dominator.type  == NodeType.ENDLOOP:
-                    isInLoop = False
-                if isInLoop:
+            for loop in get_loop_forest(f).loops:
+                loopIterators = []
+                n = loop.header
+                if n is not None and isinstance(n.expression, BinaryOperation):
+                    for ex in n.expression.expressions:
+                        if isinstance(ex, Identifier):
+                            loopIterators.append([ex.value,[]])
+                iterators += loopIterators
+                for n in loop.body_nodes():
                     if n.type == NodeType.EXPRESSION:
                         e: Expression
                         e = n.expression
                         if hasattr(e, '_expression'):
                             if e._expression._is_lvalue:
-                                for i, it in enumerate(iterators):
+                                for i, it in enumerate(loopIterators):
                                     if e._expression._value == it[0]:
-                                        if iterators[i][1] == []:
-                                            iterators[i][1] += [ f, "\n"]
-                                        iterators[i][1] += ["\t", n, "\n"]
+                                        if loopIterators[i][1] == []:
+                                            loopIterators[i][1] += [ f, "\n"]
+                                        loopIterators[i][1] += ["\t", n, "\n"]
+                if any(len(it[1]) > 5 for it in loopIterators):
+                    loops.append(loop)
             for it in iterators:
                 if len(it[1]) > 5: # If has multiple modifying | 2 for function offset + 3 for each modifying
                     res += it[1]
-        return res
+        return res, loops
         
\ No newline at end of file
@@ -5,14 +5,17 @@ from slither.core.declarations import Contract
 from slither.utils.output import Output
 from slither.core.expressions.type_conversion import TypeConversion
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.utils.analysis_index import get_analysis_index
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
-class ExplicitTypeConversion(AbstractDetector, SummaryTable):
+class ExplicitTypeConversion(CachedDetector, AbstractDetector, SummaryTable):
 
     ARGUMENT = "explicit-type-conversion"
     HELP = "Incorrect Type Conversion or Cast" 
 
     IMPACT = DetectorClassification.OPTIMIZATION
     CONFIDENCE = DetectorClassification.MEDIUM   
+    PER_CONTRACT = True
 
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/7-arithmetic#7.2.-explicit-conversion-of-types-should-be-checked-to-prevent-unexpected-results"
 
@@ -41,7 +44,7 @@ contract Cast {
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.contracts:
+        for c in self.targetContracts(self.contracts):
             res = self.findExplicit(c)
             if res: # is the result not empty
                 if results: #is the title was set
@@ -59,10 +62,12 @@ contract Cast {
                     if("_type" in e.__dict__ and e._type is not None):
                         if str(e._type) != "address":
                             res += ["\t- ", node, "\n"]
+        return res
 
     def findExplicit(self, contract: Contract):
         res = []
+        index = get_analysis_index(self.compilation_unit)
         for f in contract.functions:
-            for n in f.nodes:
+            for n in index.function(f).type_conversion_nodes:
                 res += self.has_type_conversion(n)
         return res
@@ -0,0 +1,55 @@
+from typing import Dict, Iterable, List, Optional, Set
+from slither.core.declarations import Contract
+from slither_my_plugin.utils.result_cache import detect_with_cache, get_cached_results
+from slither_my_plugin.utils.plugin_config import get_cache_dir, get_jobs, get_memory_budget
+from slither_my_plugin.utils.instrumentation import timed_contracts
+from slither_my_plugin.utils.parallel import run_detectors_in_parallel
+
+
+class CachedDetector:
+    """
+    Must be listed before AbstractDetector in the bases,
+    so the results of detect() are stored once and shared with the checklist printers and the summary tables.
+
+    Detectors whose results only depend on one contract at a time set PER_CONTRACT
+    and iterate targetContracts(), so the parallel run can split them by contract.
+    """
+
+    PER_CONTRACT = False
+    # Contracts of the shard analyzed by a worker, None outside of the sharded run
+    contractShard: Optional[Set[Contract]] = None
+
+    def shardContracts(self, contracts: List[Contract]) -> List[Contract]:
+        if self.contractShard is None:
+            return contracts
+        return [c for c in contracts if c in self.contractShard]
+
+    def targetContracts(self, contracts: List[Contract]) -> Iterable[Contract]:
+        """ The contracts to analyze, timed one by one when INSPEX_METRICS_FILE is set """
+        return timed_contracts(self, self.shardContracts(contracts))
+
+    def cacheSettings(self) -> str:
+        """ Options of the detector changing its results, part of the key of the on-disk cache """
+        return ""
+
+    def detect(self) -> List[Dict]:
+        jobs = get_jobs()
+        if jobs > 1 and get_cached_results(self.compilation_unit, self.ARGUMENT) is None:
+            # The first plugin detector runs all of them in parallel, the following ones read the cache
+            run_detectors_in_parallel([d for d in self.slither.detectors if isinstance(d, CachedDetector)], jobs)
+        cacheDir = get_cache_dir()
+        budget = get_memory_budget()
+        if cacheDir is not None and not self.slither.triage_mode:
+            # Imported on use, the hashing is not needed at plugin load when the cache is off.
+            # PER_CONTRACT detectors analyze the contracts missing from the cache one by one,
+            # smaller batches than any INSPEX_MEMORY_BUDGET, so the budget holds without batching again
+            from slither_my_plugin.utils.disk_cache import detect_with_disk_cache
+            results = detect_with_cache(self, lambda: detect_with_disk_cache(self, cacheDir))
+        elif budget is not None and self.PER_CONTRACT and not self.slither.triage_mode:
+            from slither_my_plugin.utils.memory_budget import detect_in_batches
+            results = detect_with_cache(self, lambda: detect_in_batches(self, budget))
+        else:
+            results = detect_with_cache(self, super().detect)
+        if results and self.logger:
+            self._log_result(results)
+        return results
@@ -1,40 +1,45 @@
 from pprint import pprint
-from slither_my_plugin.utils.table_generator import markdownTableFromSlitherResult
+from typing import List, Optional
+from slither_my_plugin.utils.table_generator import csv_table, markdown_table, table_rows
+from slither_my_plugin.utils.result_cache import detect_with_cache
 
 
 class SummaryTable:
+    """
+    Summary of the results of a detector, one row per result.
+    Detectors choose their columns among COLUMNS of table_generator with TABLE_HEADER.
+    """
 
-    def toTable(self):
+    TABLE_HEADER: List[str] = ["File", "Contract", "Function"]
+    # Column the rows are sorted on, None to keep the order of the results
+    TABLE_SORT: Optional[str] = "File"
+    # Set by keepTableRows() when the cached results are about to lose their elements
+    keptRows: Optional[List[List]] = None
+
+    def tableRows(self) -> List[List]:
+        """ Rows built from the cached results, detect() runs at most once per compilation unit """
+        if self.keptRows is not None:
+            return self.keptRows
+        return table_rows(detect_with_cache(self), self.TABLE_HEADER)
+
+    def keepTableRows(self):
+        """ Build the rows now, before INSPEX_MEMORY_BUDGET compacts the cached results """
+        try:
+            self.keptRows = self.tableRows()
+        except (KeyError, IndexError, TypeError):
+            pass # toTable() reports it
 
-        if "_toTable" in dir(self):
-            return self._toTable()
+    def toTable(self):
+        try:
+            return markdown_table(self.TABLE_HEADER, self.tableRows(), self.TABLE_SORT)
+        except (KeyError, IndexError, TypeError) as e:
+            # A result without the fields of the columns
+            pprint(e)
+            return ""
 
-        header = ["File", "Contract", "Function"]
+    def toCsv(self):
         try:
-            table = [header]
-            column_max_len = [len(h) for h in header]
-            detect_results = self._detect()
-            for r in detect_results:
-                row = []
-                for e in r.elements:
-                    ### ---------------edit here---------------
-                    ### Get data from object
-                    line = e['source_mapping']['lines'][0]
-                    file = "%s (L:%s)" % (e["source_mapping"]["filename_short"].split("/")[-1], line)
-                    contract = e["type_specific_fields"]["parent"]["name"]
-                    function = e["name"] + "()"
-                    ### Map to row
-                    row.append(file)
-                    row.append(contract)
-                    row.append(function)
-                    ### ---------------------------------------
-                    ### Check max len
-                    for i in range(len(row)):
-                        column_max_len[i] = column_max_len[i] if column_max_len[i] > len(row[i]) else len(row[i])
-                    table.append(row)
-                    break
-            return markdownTableFromSlitherResult(table, column_max_len, header[0])
-        except Exception as e:
-            """ If unexpected thing happen T.T """
+            return csv_table(self.TABLE_HEADER, self.tableRows(), self.TABLE_SORT)
+        except (KeyError, IndexError, TypeError) as e:
             pprint(e)
-            return ""
\ No newline at end of file
+            return ""
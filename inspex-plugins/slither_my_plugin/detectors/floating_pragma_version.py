@@ -1,11 +1,10 @@
-from pprint import pprint
 from typing import List
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
 from slither.utils.output import Output
-from slither_my_plugin.utils.table_generator import markdownTableFromSlitherResult
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
-class FloatingPragmaVersion(AbstractDetector, SummaryTable):
+class FloatingPragmaVersion(CachedDetector, AbstractDetector, SummaryTable):
 
     ARGUMENT = "floating-pragma-version"
     HELP = "Using of Improper Pragma Version"
@@ -13,6 +12,8 @@ class FloatingPragmaVersion(AbstractDetector, SummaryTable):
     IMPACT = DetectorClassification.OPTIMIZATION
     CONFIDENCE = DetectorClassification.HIGH
 
+    TABLE_HEADER = ["File", "Version"]
+
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/9-best-practices#9.3.-floating-pragma-version-should-not-be-used"
 
     WIKI_TITLE = "Floating pragma version should not be used"
@@ -56,40 +57,3 @@ pragma solidity 0;
                     break
         results.append(self.generate_result(info))
         return results
-
-    def _toTable(self):
-        """"
-        example:
-        | File | Contract | Function |
-        ------------------------------
-        """
-        ### ---------------edit here---------------
-        header = ["File", "Version"]
-        ### ---------------------------------------
-        
-        try:
-            table = [header]
-            column_max_len = [len(h) for h in header]
-            detect_results = self._detect()
-            
-            for r in detect_results:
-                row = []
-                for e in r.elements:
-                    ### ---------------edit here---------------
-                    ### Get data from object
-                    line = e['source_mapping']['lines'][0]
-                    file = "%s (L:%s)" % (e["source_mapping"]["filename_short"].split("/")[-1], line)
-                    version = e["name"]
-                    ### Map to row
-                    row.append(file)
-                    row.append(version)
-                    ### ---------------------------------------
-                    ### Check max len
-                    for i in range(len(row)):
-                        column_max_len[i] = column_max_len[i] if column_max_len[i] > len(row[i]) else len(row[i])
-                    table.append(row)
-                    break
-            return markdownTableFromSlitherResult(table, column_max_len, header[0])
-        except Exception as e:
-            pprint(e)
-            return ""
@@ -4,15 +4,17 @@ from slither.detectors.abstract_detector import AbstractDetector, DetectorClassi
 from slither.core.declarations import Contract
 from slither.utils.output import Output
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
 
-class InexplicitVariableVisibility(AbstractDetector, SummaryTable):
+class InexplicitVariableVisibility(CachedDetector, AbstractDetector, SummaryTable):
 
     ARGUMENT = "inexplicit-variable-visibility"
     HELP = "State variable should have explicit visibility"
 
     IMPACT = DetectorClassification.LOW
     CONFIDENCE = DetectorClassification.LOW
+    PER_CONTRACT = True
 
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/9-best-practices#9.1.-state-and-function-visibility-should-be-explicitly-labeled"
 
@@ -49,7 +51,7 @@ contract Visibility {
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.compilation_unit.contracts_derived:
+        for c in self.targetContracts(self.compilation_unit.contracts_derived):
             values = self.findStateviables(c)
             if len(values) == 0:
                 continue
@@ -1,8 +1,9 @@
 from slither.detectors.functions.external_function import ExternalFunction
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
 from slither.detectors.abstract_detector import DetectorClassification
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
-class InspexExternalFunction(ExternalFunction,  SummaryTable):
+class InspexExternalFunction(CachedDetector, ExternalFunction,  SummaryTable):
     ARGUMENT = "inspex-external-function"
     HELP = "Public function that could be declared external"
     IMPACT = DetectorClassification.OPTIMIZATION
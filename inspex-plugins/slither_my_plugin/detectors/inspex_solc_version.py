@@ -1,10 +1,10 @@
-from pprint import pprint
-from slither_my_plugin.utils.table_generator import markdownTableFromSlitherResult
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
 from slither.detectors.attributes.incorrect_solc import IncorrectSolc
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
-class InspexIncorrectSolc(IncorrectSolc,  SummaryTable):
+class InspexIncorrectSolc(CachedDetector, IncorrectSolc,  SummaryTable):
     ARGUMENT = "inspex-solc-version"
+    TABLE_HEADER = ["File", "Version"]
 
 
     def _detect(self):
@@ -60,41 +60,3 @@ class InspexIncorrectSolc(IncorrectSolc,  SummaryTable):
             results.append(json)
 
         return results
-
-
-    def _toTable(self):
-        """"
-        example:
-        | File | Contract | Function |
-        ------------------------------
-        """
-        ### ---------------edit here---------------
-        header = ["File", "Version"]
-        ### ---------------------------------------
-        
-        try:
-            table = [header]
-            column_max_len = [len(h) for h in header]
-            detect_results = self._detect()
-            
-            for r in detect_results:
-                row = []
-                for e in r.elements:
-                    ### ---------------edit here---------------
-                    ### Get data from object
-                    line = e['source_mapping']['lines'][0]
-                    file = "%s (L:%s)" % (e["source_mapping"]["filename_short"].split("/")[-1], line)
-                    version = e["name"]
-                    ### Map to row
-                    row.append(file)
-                    row.append(version)
-                    ### ---------------------------------------
-                    ### Check max len
-                    for i in range(len(row)):
-                        column_max_len[i] = column_max_len[i] if column_max_len[i] > len(row[i]) else len(row[i])
-                    table.append(row)
-                    break
-            return markdownTableFromSlitherResult(table, column_max_len, header[0])
-        except Exception as e:
-            pprint(e)
-            return ""
\ No newline at end of file
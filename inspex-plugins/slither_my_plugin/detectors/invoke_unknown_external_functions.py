@@ -3,16 +3,21 @@ from typing import List
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
 from slither.core.declarations import Contract
 from slither.utils.output import Output
+from slither.core.expressions import MemberAccess
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
+from slither_my_plugin.utils.analysis_index import get_analysis_index
+from slither_my_plugin.utils.expression_matcher import is_variable
 
 
-class InvokeUnknownExternalFunctions(AbstractDetector, SummaryTable):
+class InvokeUnknownExternalFunctions(CachedDetector, AbstractDetector, SummaryTable):
 
     ARGUMENT = "unknown-external-functions"
     HELP = "Invoke unknow external function"
 
     IMPACT = DetectorClassification.LOW
     CONFIDENCE = DetectorClassification.LOW
+    PER_CONTRACT = True
 
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/6-external-components#6.1.-unknown-external-components-should-not-be-invoked"
 
@@ -64,25 +69,24 @@ contract UnsafeVault {
 
     def findExternal(self, contract: Contract):
         res = []
+        index = get_analysis_index(self.compilation_unit)
 
         for f in contract.functions:
             if f.view or f.pure:
                 continue
             if f.is_implemented and f.name != 'constructor':
-                for node in f.nodes:
-                    if len(node.external_calls_as_expressions) > 0:
-                        if 'expression' in node.external_calls_as_expressions[0].called.__dict__:
-                            called = str(node.external_calls_as_expressions[0].called.expression)
-                            for param in f.parameters:
-                                if str(param) == called:
-                                    res.append(node)
+                for node in index.function(f).external_call_nodes:
+                    called = node.external_calls_as_expressions[0].called
+                    if isinstance(called, MemberAccess):
+                        if any(is_variable(called.expression, param) for param in f.parameters):
+                            res.append(node)
 
         return res
 
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.compilation_unit.contracts_derived:
+        for c in self.targetContracts(self.compilation_unit.contracts_derived):
             values = self.findExternal(c)
             if len(values) == 0:
                 continue
@@ -3,17 +3,21 @@ from typing import List
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
 from slither.core.declarations import Contract
 from slither.utils.output import Output
-from slither.core.expressions.call_expression import CallExpression
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.utils.analysis_index import get_analysis_index
+from slither_my_plugin.utils.loop_analysis import DATA_DEPENDENT_BOUNDS, get_loop_forest, loop_bound_fields
+from slither_my_plugin.utils.expression_matcher import is_solidity_call
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
 
-class LoopReverted(AbstractDetector, SummaryTable):
+class LoopReverted(CachedDetector, AbstractDetector, SummaryTable):
 
     ARGUMENT = "loop-reverted"
     HELP = "A loop of multiple element that could be reverted"
 
     IMPACT = DetectorClassification.LOW
     CONFIDENCE = DetectorClassification.LOW
+    PER_CONTRACT = True
 
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/8-denial-of-services#8.2.-unexpected-revert-should-not-make-the-whole-smart-contract-unusable"
 
@@ -36,45 +40,28 @@ function sendReward() external {
 
     def findLoopRevert(self, contract: Contract):
         res = []
+        index = get_analysis_index(self.compilation_unit)
 
         for f in contract.functions:
-            flag = False
             tmp = []
-            if f.is_implemented and f.name != 'constructor':
-                loopHeader = None
+            if f.is_implemented and f.name != 'constructor' and index.function(f).has_loop():
+                loops = [l for l in get_loop_forest(f).loops if l.bound in DATA_DEPENDENT_BOUNDS]
+                bodies = set()
+                for loop in loops:
+                    bodies |= loop.body
                 for node in f.nodes:
-                    if str(node._node_type) == 'IF_LOOP':
-                        flag = True
-                        if 'expressions' in node.expression.__dict__:
-                            for e in node.expression.expressions:
-                                if "_member_name" in e.__dict__:
-                                    if e.member_name == 'length':
-                                        flag = True
-                                        loopHeader = node
-                                        break
-                    if flag:
-                        isInLoop = False
-                        for d in node._dominance_frontier:
-                            if loopHeader == d:
-                                isInLoop = True
-                                break
-                        
-                        if isInLoop:
-                            if isinstance(node.expression, CallExpression):
-                                if "_value" in node._expression_calls[0].called.__dict__:
-                                    expName = node._expression_calls[0].called.value.name.split('(')[0]
-                                    if expName in ['require', 'assert', 'revert']:
-                                        tmp.append(node)
-
+                    if node in bodies:
+                        if is_solidity_call(node.expression, 'require', 'assert', 'revert'):
+                            tmp.append(node)
             if len(tmp) > 0:
-                res.append([f, tmp])
+                res.append([f, tmp, [l for l in loops if any(node in l for node in tmp)]])
 
         return res
 
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.compilation_unit.contracts_derived:
+        for c in self.targetContracts(self.compilation_unit.contracts_derived):
             values = self.findLoopRevert(c)
             if len(values) == 0:
                 continue
@@ -83,7 +70,7 @@ function sendReward() external {
                 info += ["\t- ", v[0], "\n"]
                 for sv in v[1]:
                     info += ["\t\t- ", sv, "\n"]
-            res = self.generate_result(info)
+            res = self.generate_result(info, additional_fields=loop_bound_fields(l for v in values for l in v[2]))
             results.append(res)
 
         return results
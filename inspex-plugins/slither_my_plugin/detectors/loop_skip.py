@@ -3,15 +3,19 @@ from slither.detectors.abstract_detector import AbstractDetector, DetectorClassi
 from slither.core.declarations import Contract
 from slither.utils.output import Output
 from slither.core.cfg.node import Node, NodeType
+from slither_my_plugin.utils.analysis_index import get_analysis_index
+from slither_my_plugin.utils.loop_analysis import get_loop_forest, loop_bound_fields
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
 
-class LoopSkip(AbstractDetector):
+class LoopSkip(CachedDetector, AbstractDetector):
 
     ARGUMENT = "loop-skip"
     HELP = "Find a potentially flow control breaking in loops"
 
     IMPACT = DetectorClassification.MEDIUM
     CONFIDENCE = DetectorClassification.MEDIUM
+    PER_CONTRACT = True
 
     WIKI = "https://docs.inspex.co/smart-contract-security-testing-guide/testing-categories/8-testing-loop-operation#8.4.-using-flow-control-expressions-over-loop-execution"
 
@@ -35,26 +39,26 @@ function registerToken(address[] memory tokens) external {
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.contracts:
-            res = self.findLoop(c)
+        for c in self.targetContracts(self.contracts):
+            res, loops = self.findLoop(c)
             if res != []:
-                results.append(self.generate_result(res))
+                results.append(self.generate_result(res, additional_fields=loop_bound_fields(loops)))
             pass
         return results
     
     def findLoop(self, contract: Contract):
         res = []
+        loops = []
+        index = get_analysis_index(self.compilation_unit)
         for f in contract.functions:
             n: Node
-            isInLoop = False
-            for n in f.nodes:
-                if n._node_type == NodeType.IFLOOP: # Not work in nested loop case
-                    isInLoop = True
-                if  hasattr(n.immediate_dominator, '_node_type') and n.immediate_dominator._node_type  == NodeType.ENDLOOP:
-                    isInLoop = False
-                if isInLoop:
-                    if n._node_type in [NodeType.RETURN, NodeType.BREAK, NodeType.CONTINUE]:
-                        res += ["\t- ", n, "\n"]
-        return res
+            forest = get_loop_forest(f)
+            for n in index.function(f).nodes_of_type(NodeType.RETURN, NodeType.BREAK, NodeType.CONTINUE):
+                loop = forest.loop_of(n)
+                if loop is not None:
+                    res += ["\t- ", n, "\n"]
+                    if loop not in loops:
+                        loops.append(loop)
+        return res, loops
 
     
\ No newline at end of file
@@ -3,15 +3,17 @@ from slither.detectors.abstract_detector import AbstractDetector, DetectorClassi
 from slither.core.declarations import Contract
 from slither.utils.output import Output
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
 
-class ModifiableOwnership(AbstractDetector, SummaryTable):
+class ModifiableOwnership(CachedDetector, AbstractDetector, SummaryTable):
 
     ARGUMENT = "modifiable-ownership"
     HELP = "Unauthorized Modifiable Ownership"
 
     IMPACT = DetectorClassification.HIGH
     CONFIDENCE = DetectorClassification.LOW
+    PER_CONTRACT = True
 
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/2-access-control#2.2.-contract-ownership-should-not-be-modifiable-by-unauthorized-actors"
 
@@ -58,7 +60,7 @@ contract Owner {
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.compilation_unit.contracts_derived:
+        for c in self.targetContracts(self.compilation_unit.contracts_derived):
             values = self.findOwner(c)
             if len(values) == 0:
                 continue
@@ -4,14 +4,18 @@ from slither.detectors.abstract_detector import AbstractDetector, DetectorClassi
 from slither.core.declarations import Contract
 from slither.utils.output import Output
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.utils.analysis_index import get_analysis_index
+from slither_my_plugin.utils.loop_analysis import DATA_DEPENDENT_BOUNDS, get_loop_forest, loop_bound_fields
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
-class StateChangingLoop(AbstractDetector, SummaryTable):
+class StateChangingLoop(CachedDetector, AbstractDetector, SummaryTable):
 
     ARGUMENT = "state-changing-loop"
     HELP = "A loop contains a state changing expression"
 
     IMPACT = DetectorClassification.LOW
     CONFIDENCE = DetectorClassification.LOW
+    PER_CONTRACT = True
 
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/8-denial-of-services#8.1.-state-changing-functions-that-loop-over-unbounded-data-structures-should-not-be-used"
 
@@ -39,42 +43,30 @@ function calculateUserInterest(address user) public view returns (uint256) {
 
     def findLoop(self, contract: Contract):
         res = []
+        index = get_analysis_index(self.compilation_unit)
 
         for f in contract.functions:
             if f.view or f.pure:
                 continue
-            flag = False
             tmp = []
-            if f.is_implemented and f.name != 'constructor':
-                loopHeader = None
+            if f.is_implemented and f.name != 'constructor' and index.function(f).has_loop():
+                loops = [l for l in get_loop_forest(f).loops if l.bound in DATA_DEPENDENT_BOUNDS]
+                bodies = set()
+                for loop in loops:
+                    bodies |= loop.body
                 for node in f.nodes:
-                    if str(node._node_type) == 'IF_LOOP':
-                        flag = True
-                        for e in node.expression.expressions:
-                            if "_member_name" in e.__dict__:
-                                if e.member_name == 'length':
-                                    flag = True
-                                    loopHeader = node
-                                    break
-                    if flag:
-                        isInLoop = False
-                        for d in node._dominance_frontier:
-                            if loopHeader == d:
-                                isInLoop = True
-                                break
-                        
-                        if isInLoop:
-                            if len(node._state_vars_written) > 0:
-                                tmp.append(node)
+                    if node in bodies:
+                        if len(node.state_variables_written) > 0:
+                            tmp.append(node)
             if len(tmp) > 0:
-                res.append([f, tmp])
+                res.append([f, tmp, [l for l in loops if any(node in l for node in tmp)]])
 
         return res
 
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.compilation_unit.contracts_derived:
+        for c in self.targetContracts(self.compilation_unit.contracts_derived):
             values = self.findLoop(c)
             if len(values) == 0:
                 continue
@@ -83,7 +75,7 @@ function calculateUserInterest(address user) public view returns (uint256) {
                 info += ["\t- ", v[0], "\n"]
                 for sv in v[1]:
                     info += ["\t\t- ", sv, "\n"]
-            res = self.generate_result(info)
+            res = self.generate_result(info, additional_fields=loop_bound_fields(l for v in values for l in v[2]))
             results.append(res)
 
         return results
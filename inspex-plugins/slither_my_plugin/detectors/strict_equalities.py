@@ -1,5 +1,6 @@
+from typing import Set
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
-from slither.analyses.data_dependency.data_dependency import is_dependent_ssa
+from slither.analyses.data_dependency.data_dependency import KEY_SSA
 from slither.core.declarations import Function
 from slither.core.declarations.function_top_level import FunctionTopLevel
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
@@ -12,23 +13,24 @@ from slither.slithir.operations import (
 )
 from slither.core.solidity_types import MappingType, ElementaryType
 from slither.core.variables.state_variable import StateVariable
+from slither.slithir.variables import Constant
 from slither.core.declarations.solidity_variables import (
     SolidityVariable,
     SolidityVariableComposed,
     SolidityFunction,
 )
-from slither_my_plugin.utils.table_generator import markdownTableFromSlitherResult
 from slither_my_plugin.detectors.extends.summary_table import SummaryTable
-from pprint import pprint
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
 
-class StrictEqualities(AbstractDetector, SummaryTable):
+class StrictEqualities(CachedDetector, AbstractDetector, SummaryTable):
 
     ARGUMENT = "strict-equalities"
     HELP = "Using of Improper Strict Equalities"
 
     IMPACT = DetectorClassification.OPTIMIZATION
     CONFIDENCE = DetectorClassification.LOW   
+    PER_CONTRACT = True
 
     WIKI = "https://inspex.gitbook.io/testing-guide/testing-items/8-denial-of-services#8.3.-strict-equalities-should-not-cause-the-function-to-be-unusable"
 
@@ -55,14 +57,22 @@ function goalReached() public returns(bool){
         return isinstance(ir, Binary) and ir.type == BinaryType.EQUAL
 
     @staticmethod
-    def is_any_tainted(variables, taints, function) -> bool:
-        return any(
-            (
-                is_dependent_ssa(var, taint, function.contract)
-                for var in variables
-                for taint in taints
-            )
-        )
+    def tainted_variables(context, taints) -> Set:
+        """
+        The taints and the variables depending on them in the SSA data dependency of the context.
+        Slither stores the transitive closure of the dependencies, so one lookup per variable is enough,
+        `var in tainted` gives the same answer as is_dependent_ssa(var, taint, context) for any taint.
+        """
+        taints = set(taints)
+        tainted = set(taints)
+        for var, sources in context.context[KEY_SSA].items():
+            if not taints.isdisjoint(sources):
+                tainted.add(var)
+        return tainted
+
+    @staticmethod
+    def is_any_tainted(variables, tainted) -> bool:
+        return any(not isinstance(var, Constant) and var in tainted for var in variables)
 
     def taint_balance_equalities(self, functions):
         taints = []
@@ -94,23 +104,61 @@ function goalReached() public returns(bool){
 
         return taints
 
+    def comparison_operands(self, func):
+        """ The == comparisons of the function as (node, non constant operands), collected once per function """
+        if func not in self._comparisons:
+            self._comparisons[func] = [
+                (node, [var for var in ir.used if not isinstance(var, Constant)])
+                for node in func.nodes
+                for ir in node.irs_ssa
+                if self.is_direct_comparison(ir)
+            ]
+        return self._comparisons[func]
+
+    def dependency_sources(self, context) -> Set:
+        """ Every variable something depends on in the SSA data dependency of the context """
+        if context not in self._sources:
+            sources = set()
+            for s in context.context[KEY_SSA].values():
+                sources |= s
+            self._sources[context] = sources
+        return self._sources[context]
+
     # Retrieve all tainted (node, function) pairs
     def tainted_equality_nodes(self, funcs, taints):
         results = {}
-        taints += self.sources_taint
+        taints = set(taints + self.sources_taint)
 
         for func in funcs:
             # Disable the detector on top level function until we have good taint on those
             if isinstance(func, FunctionTopLevel):
                 continue
-            for node in func.nodes:
-                for ir in node.irs_ssa:
+            comparisons = self.comparison_operands(func)
+            if not comparisons:
+                continue
 
-                    # Filter to only tainted equality (==) comparisons
-                    if self.is_direct_comparison(ir) and self.is_any_tainted(ir.used, taints, func):
-                        if func not in results:
-                            results[func] = []
-                        results[func].append(node)
+            # Only the taints something depends on in the context, or compared directly, can change the result.
+            # A library function is reached from every contract using it and is computed once per set of taints.
+            # Inherited functions are not shared: slither copies them into every derived contract,
+            # each copy has its own IRs and the data dependency of that contract
+            context = func.contract
+            context_taints = frozenset(taints & self.dependency_sources(context))
+            direct_taints = frozenset(var for _, operands in comparisons for var in operands if var in taints)
+            key = (func, context_taints, direct_taints)
+            if key not in self._function_results:
+                if (context, context_taints) not in self._tainted:
+                    self._tainted[(context, context_taints)] = self.tainted_variables(context, context_taints)
+                tainted = self._tainted[(context, context_taints)]
+                # Filter to only tainted equality (==) comparisons
+                self._function_results[key] = [
+                    node
+                    for node, operands in comparisons
+                    if self.is_any_tainted(operands, tainted) or self.is_any_tainted(operands, direct_taints)
+                ]
+
+            nodes = self._function_results[key]
+            if nodes:
+                results[func] = list(nodes)
 
         return results
 
@@ -127,8 +175,12 @@ function goalReached() public returns(bool){
 
     def _detect(self):
         results = []
+        self._comparisons = {}
+        self._sources = {}
+        self._tainted = {}
+        self._function_results = {}
 
-        for c in self.compilation_unit.contracts_derived:
+        for c in self.targetContracts(self.compilation_unit.contracts_derived):
             ret = self.detect_strict_equality(c)
 
             # sort ret to get deterministic results
@@ -148,41 +200,3 @@ function goalReached() public returns(bool){
                     results.append(res)
                     
         return results
-
-    def _toTable(self):
-        """"
-        example:
-        | File | Contract | Function |
-        ------------------------------
-        """
-        ### ---------------edit here---------------
-        header = ["File", "Contract", "Function"]
-        ### ---------------------------------------
-        
-        try:
-            table = [header]
-            column_max_len = [len(h) for h in header]
-            detect_results = self._detect()
-            for r in detect_results:
-                row = []
-                for e in r.elements:
-                    ### ---------------edit here---------------
-                    ### Get data from object
-                    line = e['source_mapping']['lines'][0]
-                    file = "%s (L:%s)" % (e["source_mapping"]["filename_short"].split("/")[-1], line)
-                    contract = e["type_specific_fields"]["parent"]["name"]
-                    function = e["name"] + "()"
-                    ### Map to row
-                    row.append(file)
-                    row.append(contract)
-                    row.append(function)
-                    ### ---------------------------------------
-                    ### Check max len
-                    for i in range(len(row)):
-                        column_max_len[i] = column_max_len[i] if column_max_len[i] > len(row[i]) else len(row[i])
-                    table.append(row)
-                    break
-            return markdownTableFromSlitherResult(table, column_max_len, header[0])
-        except Exception as e:
-            pprint(e)
-            return ""
\ No newline at end of file
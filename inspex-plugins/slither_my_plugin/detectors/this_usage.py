@@ -2,14 +2,19 @@ from typing import List
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
 from slither.core.declarations import Contract
 from slither.utils.output import Output
+from slither.core.cfg.node import NodeType
+from slither_my_plugin.utils.analysis_index import get_analysis_index
+from slither_my_plugin.utils.expression_matcher import uses_this
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
-class SelfInvocation(AbstractDetector):
+class SelfInvocation(CachedDetector, AbstractDetector):
 
     ARGUMENT = "this-usage"
     HELP = "Using of to invoke internal function instead of jump"
 
     IMPACT = DetectorClassification.MEDIUM
     CONFIDENCE = DetectorClassification.LOW
+    PER_CONTRACT = True
 
     WIKI = "Au's challenge"
 
@@ -38,7 +43,7 @@ function bulkBuy(uint256[] calldata offerIds) public {
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.contracts:
+        for c in self.targetContracts(self.contracts):
             # if c.name != 'SimpleNFTMarketplace':
                 # continue
             res = self.findAssert(c)
@@ -48,10 +53,11 @@ function bulkBuy(uint256[] calldata offerIds) public {
 
     def findAssert(self, contract: Contract):
         res = []
+        index = get_analysis_index(self.compilation_unit)
         for f in contract.functions:
             # if f.name != 'bulkOffer':
             #     continue
-            for n in f.nodes:
+            for n in index.function(f).nodes_of_type(NodeType.EXPRESSION):
                 # print(n.type)
                 detect = self.hasThis(n)
                 if detect != None:
@@ -64,8 +70,6 @@ function bulkBuy(uint256[] calldata offerIds) public {
 
     def hasThis(self, _node):
         # print(_node)
-        if(str(_node.type) == "EXPRESSION"):
-            # isinstance(_node.expression, CallExpression)
-            if "this." in str(_node).lower(): # Crude but should do the trick
-                return _node
+        if _node.type == NodeType.EXPRESSION and uses_this(_node.expression):
+            return _node
         return None
\ No newline at end of file
@@ -3,15 +3,17 @@ from slither.detectors.abstract_detector import AbstractDetector, DetectorClassi
 from slither.core.declarations import Contract, Modifier
 from slither.core.cfg.node import Node
 from slither.utils.output import Output
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
 
 
-class UnsafeInitiate(AbstractDetector):
+class UnsafeInitiate(CachedDetector, AbstractDetector):
 
     ARGUMENT = "unsafe-initiate"
     HELP = "Find the initialize() function without any access control"
 
     IMPACT = DetectorClassification.HIGH
     CONFIDENCE = DetectorClassification.MEDIUM
+    PER_CONTRACT = True
 
     WIKI = "https://docs.inspex.co/smart-contract-security-testing-guide/testing-categories/9-testing-contract-upgradability#9.2.-the-initialize-function-implementation"
 
@@ -40,7 +42,7 @@ contract Initialize {
 
     def _detect(self) -> List[Output]:
         results: List[Output] = []
-        for c in self.contracts:
+        for c in self.targetContracts(self.contracts):
             res = self.findInitFunc(c)
             if res != []:
                 results.append(self.generate_result(res))
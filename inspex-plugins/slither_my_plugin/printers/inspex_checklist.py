@@ -1,8 +1,16 @@
+import logging
 from slither.printers.abstract_printer import AbstractPrinter
+from contextlib import ExitStack
 from pathlib import Path
-import xlsxwriter
-import csv
-import re
+from slither_my_plugin.utils.result_cache import cache_results, detect_with_cache
+from slither_my_plugin.utils.plugin_config import get_checklist_output, get_checklist_sections, get_csv_file, get_jobs, get_memory_budget, get_results_file, get_xlsx_file
+from slither_my_plugin.utils.output_sink import FileSink, open_sink
+from slither_my_plugin.utils.results_file import write_results_file
+from slither_my_plugin.utils.checklist_model import ItemStatus, build_checklist
+from slither_my_plugin.utils.parallel import run_detectors_in_parallel
+from slither_my_plugin.utils.instrumentation import timed_phase
+from slither_my_plugin.utils.profiling import profiled
+from slither_my_plugin.detectors.extends.summary_table import SummaryTable
 
 STANDARD_ISSUES = [
         [ "1. Testing Arithmetic Operation and Conversion",
@@ -88,12 +96,68 @@ STANDARD_ISSUES = [
         ["9.3.1    Storage slot allocation should not conflict", []]]]
     ]
 
+class LazyDetectorMapping(dict):
+    """
+    Detector ARGUMENT -> results. A detector is only evaluated the first time a checklist row asks for it,
+    so the detectors that are not part of the checklist never run.
+    """
+
+    def __init__(self, detectors):
+        super().__init__()
+        self.detectors = {}
+        for d in detectors:
+            self.detectors.setdefault(d.ARGUMENT, []).append(d)
+
+    def __missing__(self, argument):
+        res = []
+        for d in self.detectors.get(argument, []): # One instance per compilation unit
+            d.logger = None
+            res += detect_with_cache(d)
+        self[argument] = res
+        return res
+
+    def release(self, argument):
+        """
+        Keep only the rendered fields of the results of `argument` once the checklist has its lines,
+        in the result cache as well, so the elements of the findings can be freed.
+        The summary tables build their rows before, the later printers and INSPEX_RESULTS_FILE read the compacted results.
+        """
+        from slither_my_plugin.utils.memory_budget import compact_results
+        res = []
+        for d in self.detectors.get(argument, []):
+            if isinstance(d, SummaryTable):
+                d.keepTableRows()
+            results = compact_results(detect_with_cache(d))
+            cache_results(d.compilation_unit, argument, results)
+            res += results
+        self[argument] = res
+
 class InspexTestingGuideChecklist(AbstractPrinter):
     ARGUMENT = "inspex-checklist"
     HELP = "Print results of the detectors according to Inspex's Smart Contract Security Testing Guide."
 
     WIKI = "https://inspex.gitbook.io/testing-guide/"
-    result = ''
+    # Set by fromResults() to render saved results instead of running the detectors
+    detectorMapping = None
+    savedSections = None
+    # Where the lines are written, see open_sink(). None for INSPEX_CHECKLIST_OUTPUT, or stdout
+    sinkTarget = None
+    # Opened by output(), one per instance and per report
+    sink = None
+    # Built once from the detector results, see buildChecklist()
+    checklist = None
+
+    @classmethod
+    def fromResults(cls, detectorMapping, sections=None, sink=None):
+        """ Printer rendering the detector results saved in a previous run, without Slither """
+        printer = cls.__new__(cls)
+        printer.slither = None
+        printer.logger = None
+        printer.detectorMapping = detectorMapping
+        printer.savedSections = sections
+        printer.sinkTarget = sink
+        return printer
+
     def filterDetector(self):
         filteredDetectors = STANDARD_ISSUES.copy()
         for i, issue in enumerate(STANDARD_ISSUES):
@@ -106,75 +170,141 @@ class InspexTestingGuideChecklist(AbstractPrinter):
         return filteredDetectors
 
     def createDetectorMapping(self):
-        res = {}
-        for d in self.slither.detectors:
-            d.logger = None
-            res[d.ARGUMENT] = d.detect()
+        if self.detectorMapping is not None:
+            return self.detectorMapping
+        jobs = get_jobs()
+        if jobs > 1:
+            arguments = self.checklistArguments()
+            run_detectors_in_parallel([d for d in self.slither.detectors if d.ARGUMENT in arguments], jobs)
+        self.detectorMapping = LazyDetectorMapping(self.slither.detectors)
+        return self.detectorMapping
+
+    def saveResults(self):
+        """ Write the results of the checklist detectors to INSPEX_RESULTS_FILE, to render them again with slither_my_plugin.render """
+        path = get_results_file()
+        # Once per run, the results of every compilation unit are already merged in the mapping
+        if path is None or self.slither is None or not self.isReportPrinter():
+            return
+        detectorMap = self.createDetectorMapping()
+        results = {arg: detectorMap[arg] for arg in sorted(self.checklistArguments())}
+        write_results_file(path, results, self.checklistSections())
+
+    def checklistArguments(self):
+        res = set()
+        for standard in self.filterStandardIssues():
+            for testing in standard[1:]:
+                for issue in testing[1:]:
+                    res.update(issue[1])
         return res
 
     @staticmethod
-    def formatIssue(_str: str) -> str:
-        _str = _str.lstrip()
-        return  re.sub(r'^- ?', '', _str)
-    
+    def sectionId(title: str) -> str:
+        return title.split()[0].rstrip('.')
+
+    @staticmethod
+    def isSectionSelected(sectionId: str, sections) -> bool:
+        return any(sectionId == s or sectionId.startswith(s + '.') for s in sections)
+
+    def checklistSections(self):
+        sections = get_checklist_sections()
+        if sections is None:
+            return self.savedSections
+        return sections
+
+    def filterStandardIssues(self):
+        """ Keep only the sections listed in INSPEX_CHECKLIST_SECTIONS, e.g. `5,8` or `8.5` """
+        sections = self.checklistSections()
+        if sections is None:
+            return STANDARD_ISSUES
+        res = []
+        for standard in STANDARD_ISSUES:
+            standardId = self.sectionId(standard[0])
+            if self.isSectionSelected(standardId, sections):
+                res.append(standard)
+                continue
+            testings = [t for t in standard[1:] if self.isSectionSelected(self.sectionId(t[0]), sections)]
+            if len(testings) > 0:
+                res.append([standard[0]] + testings)
+        return res
+
+    def openSink(self):
+        target = self.sinkTarget
+        if target is None:
+            target = get_checklist_output()
+        return open_sink(target)
+
+    def log(self, message: str, level: int = logging.INFO):
+        """ Messages about the files written go to the logger, stdout may be the report """
+        if self.logger:
+            self.logger.log(level, message)
+
     def addResult(self, line :str):
-        self.result += line + '\n'
+        self.sink.write(line)
     
     def deliverResult(self, result):
-        print(self.result)
+        self.sink.close()
+
+    def buildChecklist(self):
+        if self.checklist is None:
+            detectorMap = self.createDetectorMapping()
+            release = None
+            if get_memory_budget() is not None and isinstance(detectorMap, LazyDetectorMapping):
+                release = detectorMap.release
+            self.checklist = build_checklist(self.filterStandardIssues(), detectorMap, release)
+        return self.checklist
+
+    def isReportPrinter(self) -> bool:
+        """
+        Slither creates one printer per compilation unit, but the checklist covers the detectors of all of them.
+        Only the printer of the first compilation unit writes the report, the others would write it again.
+        """
+        return self.slither is None or self.compilation_unit is self.slither.compilation_units[0]
 
     def output(self, _filename):
+        if not self.isReportPrinter():
+            return self.generate_output("")
+        self.sink = self.openSink()
         oResult = self._output(_filename)
         self.deliverResult(oResult)
+        self.saveResults()
         return oResult
     
+    def phase(self, name: str):
+        """ Block timed with INSPEX_METRICS_FILE and profiled as `<ARGUMENT>.<name>` with INSPEX_PROFILE_DIR """
+        stack = ExitStack()
+        stack.enter_context(timed_phase(self.ARGUMENT, name))
+        stack.enter_context(profiled(f"{self.ARGUMENT}.{name}"))
+        return stack
+
     def _output(self, _filename):
-        res = ''
-        total = 0
-        detected = []
-        detectorMap = self.createDetectorMapping()
-        
-        for standard in STANDARD_ISSUES:
-            self.addResult(standard[0])
-            count = 0
-            for testing in standard[1:]:
-                self.addResult(f'\t{testing[0]}')
-                for issue in testing[1:]:
-                    subHead = issue[0]
-                    headFindings = []
-                    for arg in issue[1]: # For each detecotr, which some dont have
-                        iss = []
-                        iss = detectorMap[arg]
-                        for i in iss:
-                            for l in i["description"].split('\n'):
-                                if len(l) == 0: # blank lines
-                                    continue
-                                finding = self.formatIssue(l)
-                                if '#' in finding:
-                                    count += 1
-                                    total += 1
-                                    headFindings.append(f'- [ ] (IDX-{total}) {finding}') # Print each findings
-                                    detected.append(f'- [ ] (IDX-{total}) {subHead} | {finding}')
-                    if len(issue[1]) == 0: # Dont have any supported detector
-                        subHead = f'❗️ {subHead}'
-                        headFindings = ['- [ ] Checked ( There are no supported detectors at the moment. Please manually audit. )']
-                        count += 1
-                    elif len(headFindings) == 0:
-                        subHead = f'✅ {subHead}'
-                        headFindings = ['( No issue found )']
-                    else:
-                        subHead = f'🔎 {subHead}'
-                    self.addResult(f'\t  {subHead}')
-                    for f in headFindings:
-                        self.addResult(f'\t{f}')
+        with self.phase("detectors"):
+            checklist = self.buildChecklist()
+        with self.phase("render"):
+            self.renderChecklist(checklist)
+        return self.generate_output("")
+
+    def renderChecklist(self, checklist):
+        for section in checklist.sections:
+            self.addResult(section.label)
+            for group in section.groups:
+                self.addResult(f'\t{group.label}')
+                for item in group.items:
+                    status = item.status
+                    self.addResult(f'\t  {status.value} {item.label}')
+                    if status == ItemStatus.UNSUPPORTED: # Dont have any supported detector
+                        self.addResult('\t- [ ] Checked ( There are no supported detectors at the moment. Please manually audit. )')
+                    elif status == ItemStatus.NO_ISSUE:
+                        self.addResult('\t( No issue found )')
+                    for f in item.findings:
+                        self.addResult(f'\t- [ ] ({f.idx}) {f.description}')
                     self.addResult('')
-            self.addResult(f'There are {count} issue(s) need too be addressed')
+            self.addResult(f'There are {section.count} issue(s) need too be addressed')
             self.addResult('-'*3+'\n')
+            self.sink.flush() # The sections are streamed as they are done
 
         self.addResult('##All detected issues\n')
-        for i in detected:
-            self.addResult(i)
-        return self.generate_output("")
+        for f in checklist.findings:
+            self.addResult(f'- [ ] ({f.idx}) {f.item.label} | {f.description}')
     
 class InspexTestingGuideChecklistCSV(InspexTestingGuideChecklist):
     ARGUMENT = "inspex-checklist-csv"
@@ -182,52 +312,99 @@ class InspexTestingGuideChecklistCSV(InspexTestingGuideChecklist):
     WIKI = "https://inspex.gitbook.io/testing-guide/"
 
     response = {
-        '✅': 'No issues found',
-        '🔎': 'Found some issues. Please look at the full result',
-        '❗️': 'There are no supported detectors',
+        ItemStatus.NO_ISSUE: 'No issues found',
+        ItemStatus.FOUND: 'Found some issues. Please look at the full result',
+        ItemStatus.UNSUPPORTED: 'There are no supported detectors',
     }
+    checklistHeader = ['Testing-ID', 'Title', 'Checked', 'Notes']
+    issueHeader = ['ID', 'Standard', 'Issue', 'Checked']
 
-    def addResult(self, line :str):
-        if self.result == '': # add header
-            self.result += 'Testing-ID,Title,Checked,Notes\n'
-        line = line.lstrip()
-        if re.match(r'^[1-9]\.\s+',line):
-            self.result += re.sub(r'^[1-9]\.\s+','',line) + ',,,' + '\n'
-        elif re.match(r'^[1-9]\.\d\s+',line):
-            reg = re.match(r'^([1-9]\.\d)(\s+)(.+)',line)
-            self.result += f'{reg[1]},{reg[3]},,\n'
-        elif re.match(r'^(✅|🔎|❗️)\s+([1-9]\.\d\.\d{1,2})\s+(.+)',line):
-            reg = re.match(r'^(✅|🔎|❗️)\s+([1-9]\.\d\.\d{1,2})\s+(.+)',line)
-            self.result += f'{reg[2]},{reg[3]},{reg[1]},{self.response[reg[1]]}\n'
-        elif re.match(r'^-\s\[\s\]\s\((IDX-\d+)\)\s(\d\.\d\.\d+)\s+(.+) \| (.+)',line):
-            reg = re.match(r'^-\s\[\s\]\s\((IDX-\d+)\)\s(\d\.\d\.\d+)\s+(.+) \| (.+)',line)
-            self.result += f'{reg[1]},{reg[2]+" "+reg[3]},"{reg[4]}",\n'
-        elif re.match(r'^##All',line):
-            self.result += f'\nID,Standard,Issue,Checked\n'
+    def checklistRows(self, checklist):
+        """ (kind, row) of the checklist table, kind is `header`, `section`, `group` or `item` """
+        yield 'header', self.checklistHeader
+        for section in checklist.sections:
+            yield 'section', [section.title, '', '', '']
+            for group in section.groups:
+                yield 'group', [group.id, group.title, '', '']
+                for item in group.items:
+                    status = item.status
+                    yield 'item', [item.id, item.title, status.value, self.response[status]]
+
+    @staticmethod
+    def issueRows(checklist):
+        for f in checklist.findings:
+            yield [f.idx, f'{f.item.id} {f.item.title}', f.description, '']
+
+    @staticmethod
+    def csvField(value: str, quote: bool = False) -> str:
+        if quote or any(c in value for c in ',"\r\n'):
+            return '"' + value.replace('"', '""') + '"'
+        return value
+
+    def addRow(self, row, quoted=()):
+        self.addResult(','.join(self.csvField(v, i in quoted) for i, v in enumerate(row)))
+
+    def renderChecklist(self, checklist):
+        for _, row in self.checklistRows(checklist):
+            self.addRow(row)
+        self.addResult('')
+        self.addRow(self.issueHeader)
+        for row in self.issueRows(checklist):
+            self.addRow(row, quoted=(2,)) # The issues were always quoted
 
 class InspexTestingGuideChecklistXLS(InspexTestingGuideChecklistCSV):
     ARGUMENT = "inspex-checklist-xls"
     HELP = "Print results of the detectors according to Inspex's Smart Contract Security Testing Guide in xls file."
     WIKI = "https://inspex.gitbook.io/testing-guide/"
 
+    defaultWorkbookFile = "InspexChecklist.xlsx"
+    # Set to write the workbook elsewhere than INSPEX_XLSX_FILE
+    workbookFile = None
+
+    def workbookPath(self):
+        if self.workbookFile is not None:
+            return self.workbookFile
+        path = get_xlsx_file()
+        if path is None:
+            return self.defaultWorkbookFile
+        return path
+
+    def openSink(self):
+        # No line is written, the report is the workbook
+        return None
+
     def deliverResult(self, result):
-        workbook = xlsxwriter.Workbook("InspexChecklist.xlsx", {'in_memory': True})
+        pass
+
+    def renderChecklist(self, checklist):
+        try:
+            # Optional dependency, imported only when a workbook is asked so loading the plugin stays cheap
+            import xlsxwriter
+        except ImportError:
+            self.log("The checklist file cannot be created, xlsxwriter is not installed. Run `pip install xlsxwriter`.", logging.ERROR)
+            return
+        path = self.workbookPath()
+        # Rows are flushed to disk as soon as the next row starts, the memory does not grow with the issues
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
 
         ws1 = workbook.add_worksheet("Checklist")
-        # Set heading
+        # Set heading, in row order as the previous rows are already written
         ws1.set_column_pixels(0,0,90)
         scaling = 0.73
         headFormat = workbook.add_format({'border_color': '#FF9900', 'bg_color':'#FF9900'})
         headBU = workbook.add_format({'bold': True, 'underline': True, 'border_color': '#FF9900', 'bg_color':'#FF9900'})
         headU = workbook.add_format({'underline': True, 'border_color': '#FF9900', 'bg_color':'#FF9900'})
-        for i in range(4):
-            ws1.write_column(0,i,[None,None,None,None,None], headFormat)
         ws1.insert_image(0,0,(Path(__file__).parent /  'inspex_logo.png').resolve(), {'object_position': 3, 'x_offset': 8, 'x_scale': scaling, 'y_scale': scaling})
+        ws1.write_row(0,0,[None,None,None,None], headFormat)
+        ws1.write_blank(1,0,None, headFormat)
         ws1.merge_range('B2:D2', 'Smart Contract Security Testing Guide Checklist', headBU)
+        ws1.write_blank(2,0,None, headFormat)
         ws1.merge_range('B3:D3', 'A comprehensive outline for ensuring that smart contracts remain fortified against general exploits', headFormat)
+        ws1.write_row(3,0,[None,None,None,None], headFormat)
         ws1.merge_range('B4:D4', 'https://docs.inspex.co/smart-contract-security-testing-guide/')
         ws1.write_url('B4', 'https://docs.inspex.co/smart-contract-security-testing-guide/')
         ws1.write_rich_string('B4', 'For in-depth detail: ', headU, 'https://docs.inspex.co/smart-contract-security-testing-guide/', headFormat)
+        ws1.write_row(4,0,[None,None,None,None], headFormat)
         
         white = workbook.add_format({'border_color': 'white', 'bg_color':'white'})
         whiteB = workbook.add_format({'bold': True, 'border_color': 'white', 'bg_color':'white'})
@@ -238,24 +415,18 @@ class InspexTestingGuideChecklistXLS(InspexTestingGuideChecklistCSV):
         ws1.set_column_pixels(3,3,290)
         grayB = workbook.add_format({'bold': True, 'border_color': '#CCCCCC', 'bg_color':'#CCCCCC'})
         grayBU = workbook.add_format({'bold': True, 'underline': True, 'border_color': '#CCCCCC', 'bg_color':'#CCCCCC'})
-        lines = self.result.split('\n')
-        i = 0
         offset = 6
-        while lines[i] != '':
-            line = [ '{}'.format(x) for x in list(csv.reader([lines[i]], delimiter=',', quotechar='"'))[0] ]
-            if line[1] == '':
+        for i, (kind, line) in enumerate(self.checklistRows(checklist)):
+            if kind == 'section':
                 ws1.merge_range(offset+i,0,offset+i,3, line[0], grayB)
-            elif re.match(r'^\d\.\d{1,2}$' ,line[0]):
+            elif kind == 'group':
                 ws1.write_string(offset+i,0,line[0], grayB)
                 ws1.write_row(offset+i,1,line[1:], grayBU)
+            elif kind == 'header':
+                ws1.write_row(offset+i,0,line, whiteB)
             else:
-                if line[1] == 'Title':
-                    blankWhiteB = workbook.add_format({'bold': True, 'border_color': 'white', 'bg_color':'white'})
-                    ws1.write_row(offset+i,0,line, blankWhiteB)
-                else:
-                    ws1.write_string(offset+i,0,line[0], whiteB)
-                    ws1.write_row(offset+i,1,line[1:], white)
-            i += 1
+                ws1.write_string(offset+i,0,line[0], whiteB)
+                ws1.write_row(offset+i,1,line[1:], white)
 
         ws2 = workbook.add_worksheet("Issues")
         ws2.set_column_pixels(0,0,50)
@@ -263,15 +434,48 @@ class InspexTestingGuideChecklistXLS(InspexTestingGuideChecklistCSV):
         ws2.set_column_pixels(2,2,400)
         bold = workbook.add_format({'bold': True})
         wrap = workbook.add_format({'text_wrap': True})
-        i += 1
-        sheet2Offset = i
-        while i < len(lines)-1:
-            line = [ '{}'.format(x) for x in list(csv.reader([lines[i]], delimiter=',', quotechar='"'))[0] ]
-            print(line)
-            if line[0] == 'ID':
-                ws2.write_row(0,0, line, bold)
-            else:
-                ws2.write_row(i-sheet2Offset,0, line, wrap)
-            i += 1
+        ws2.write_row(0,0, self.issueHeader, bold)
+        for i, line in enumerate(self.issueRows(checklist)):
+            ws2.write_row(i+1,0, line, wrap)
         workbook.close()
-        print("The checklist file, 'InspexChecklist.xlsx', has been created.")
\ No newline at end of file
+        self.log(f"The checklist file, '{path}', has been created.")
+
+
+class InspexTestingGuideChecklistAll(InspexTestingGuideChecklist):
+    ARGUMENT = "inspex-checklist-all"
+    HELP = "Print the checklist, and create its CSV and xls files, from a single run of the detectors."
+    WIKI = "https://inspex.gitbook.io/testing-guide/"
+
+    defaultCsvFile = "InspexChecklist.csv"
+
+    def csvPath(self):
+        path = get_csv_file()
+        if path is None:
+            return self.defaultCsvFile
+        return path
+
+    def output(self, _filename):
+        if not self.isReportPrinter():
+            return self.generate_output("")
+        detectorMap = self.createDetectorMapping()
+        sections = self.checklistSections()
+        with self.phase("detectors"):
+            checklist = self.buildChecklist()
+
+        printer = InspexTestingGuideChecklist.fromResults(detectorMap, sections, self.sinkTarget)
+        printer.checklist = checklist
+        oResult = printer.output(_filename)
+
+        csvPath = self.csvPath()
+        printer = InspexTestingGuideChecklistCSV.fromResults(detectorMap, sections, FileSink(csvPath, newline=""))
+        printer.checklist = checklist
+        printer.output(_filename)
+        self.log(f"The checklist file, '{csvPath}', has been created.")
+
+        printer = InspexTestingGuideChecklistXLS.fromResults(detectorMap, sections)
+        printer.logger = self.logger
+        printer.checklist = checklist
+        printer.output(_filename)
+
+        self.saveResults()
+        return oResult
@@ -0,0 +1,56 @@
+"""
+Render the checklist again from the detector results saved with INSPEX_RESULTS_FILE, without compiling the contracts.
+
+    INSPEX_RESULTS_FILE=results.json slither . --print inspex-checklist
+    python -m slither_my_plugin.render results.json --format xls
+"""
+import argparse
+import logging
+from slither_my_plugin.printers.inspex_checklist import (
+    InspexTestingGuideChecklist,
+    InspexTestingGuideChecklistCSV,
+    InspexTestingGuideChecklistXLS,
+    InspexTestingGuideChecklistAll,
+)
+from slither_my_plugin.utils.results_file import read_results_file
+
+PRINTERS = {
+    "text": InspexTestingGuideChecklist,
+    "csv": InspexTestingGuideChecklistCSV,
+    "xls": InspexTestingGuideChecklistXLS,
+    "all": InspexTestingGuideChecklistAll,
+}
+
+
+def status_logger() -> logging.Logger:
+    """ The messages about the files written go to stderr, the text and CSV reports may be on stdout """
+    logger = logging.getLogger("InspexChecklist")
+    if not logger.handlers:
+        # Slither configures the root logger at import, this one does not depend on it
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the Inspex checklist from saved detector results.")
+    parser.add_argument("results", help="File written by the checklist printers when INSPEX_RESULTS_FILE is set")
+    parser.add_argument("--format", choices=sorted(PRINTERS), default="text")
+    parser.add_argument("--output", help="File the report is written to, stdout by default for the text and CSV formats")
+    args = parser.parse_args()
+
+    detectorMap, sections = read_results_file(args.results)
+    if args.format == "xls":
+        printer = PRINTERS[args.format].fromResults(detectorMap, sections)
+        printer.workbookFile = args.output
+    else:
+        printer = PRINTERS[args.format].fromResults(detectorMap, sections, args.output)
+    printer.logger = status_logger()
+    printer.output(args.results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from typing import Dict, Iterable, List, Set
+from weakref import WeakKeyDictionary
+from slither.core.cfg.node import Node, NodeType
+from slither.core.compilation_unit import SlitherCompilationUnit
+from slither.core.declarations import Function
+from slither.slithir.operations import EventCall, InternalCall, TypeConversion
+
+
+class FunctionIndex:
+    """
+    Nodes of a single function, bucketed during one pass over its CFG.
+    Every bucket keeps the order of `function.nodes`.
+    """
+
+    def __init__(self, function: Function):
+        self.function = function
+        self.nodes_by_type: Dict[NodeType, List[Node]] = {}
+        self.external_call_nodes: List[Node] = []
+        self.require_or_assert_nodes: List[Node] = []
+        self.event_nodes: List[Node] = []
+        self.type_conversion_nodes: List[Node] = []
+        # Internal calls and modifiers, in order of first call
+        self.callees: List[Function] = []
+
+        for node in function.nodes:
+            self.nodes_by_type.setdefault(node.type, []).append(node)
+            if len(node.external_calls_as_expressions) > 0:
+                self.external_call_nodes.append(node)
+            if node.contains_require_or_assert():
+                self.require_or_assert_nodes.append(node)
+            irs = node.irs
+            if any(isinstance(ir, EventCall) for ir in irs):
+                self.event_nodes.append(node)
+            if any(isinstance(ir, TypeConversion) for ir in irs):
+                self.type_conversion_nodes.append(node)
+            for ir in irs:
+                if isinstance(ir, InternalCall) and isinstance(ir.function, Function) and ir.function not in self.callees:
+                    self.callees.append(ir.function)
+        for m in function.modifiers:
+            if m not in self.callees:
+                self.callees.append(m)
+
+    def nodes_of_type(self, *types: NodeType) -> List[Node]:
+        if len(types) == 1:
+            return self.nodes_by_type.get(types[0], [])
+        nodes = []
+        for t in types:
+            nodes += self.nodes_by_type.get(t, [])
+        return sorted(nodes, key=lambda n: n.node_id)
+
+    def has_loop(self) -> bool:
+        return NodeType.STARTLOOP in self.nodes_by_type
+
+
+class AnalysisIndex:
+    """
+    Per compilation unit index shared by the plugin detectors.
+    Each function is indexed the first time a detector asks for it, and only once.
+    """
+
+    def __init__(self, compilation_unit: SlitherCompilationUnit):
+        self.compilation_unit = compilation_unit
+        self._functions: Dict[Function, FunctionIndex] = {}
+        self._summarized: Set[Function] = set()
+        self._emitters: Set[Function] = set()
+
+    def function(self, function: Function) -> FunctionIndex:
+        if function not in self._functions:
+            self._functions[function] = FunctionIndex(function)
+        return self._functions[function]
+
+    def emits_event(self, function: Function) -> bool:
+        """ Whether the function, or a function or modifier it calls internally, emits an event """
+        if function not in self._summarized:
+            roots = list(self.compilation_unit.functions_and_modifiers) + list(self.compilation_unit.functions_top_level)
+            self._summarize(roots + [function])
+        return function in self._emitters
+
+    def _summarize(self, roots: Iterable[Function]):
+        """
+        Emit summaries of the whole call graph at once:
+        the functions emitting an event themselves mark their callers, then the callers of these, and so on.
+        Recursive calls need no special case, a function is marked once.
+        """
+        callers: Dict[Function, List[Function]] = {}
+        emitters: List[Function] = []
+        todo = list(roots)
+        seen = set(todo)
+        while todo:
+            f = todo.pop()
+            index = self.function(f)
+            if index.event_nodes:
+                emitters.append(f)
+            for callee in index.callees:
+                callers.setdefault(callee, []).append(f)
+                if callee not in seen:
+                    seen.add(callee)
+                    todo.append(callee)
+
+        marked = set(emitters)
+        while emitters:
+            f = emitters.pop()
+            for caller in callers.get(f, []):
+                if caller not in marked:
+                    marked.add(caller)
+                    emitters.append(caller)
+        self._summarized = seen
+        self._emitters = marked
+
+
+_indexes: "WeakKeyDictionary[SlitherCompilationUnit, AnalysisIndex]" = WeakKeyDictionary()
+
+
+def get_analysis_index(compilation_unit: SlitherCompilationUnit) -> AnalysisIndex:
+    if compilation_unit not in _indexes:
+        _indexes[compilation_unit] = AnalysisIndex(compilation_unit)
+    return _indexes[compilation_unit]
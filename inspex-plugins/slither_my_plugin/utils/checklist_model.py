@@ -0,0 +1,118 @@
+from collections import Counter
+from enum import Enum
+from typing import Callable, Dict, Iterator, List, Optional
+import re
+
+_BULLET = re.compile(r"^- ?")
+
+
+class ItemStatus(Enum):
+    NO_ISSUE = "✅"
+    FOUND = "🔎"
+    UNSUPPORTED = "❗️"
+
+
+class Finding:
+    """ A line of a detector result, numbered in the order of the checklist """
+
+    def __init__(self, number: int, item: "TestItem", description: str):
+        self.number = number
+        self.item = item
+        self.description = description
+
+    @property
+    def idx(self) -> str:
+        return f"IDX-{self.number}"
+
+
+class Heading:
+    """ `label` is the title as written in STANDARD_ISSUES, e.g. `1.1\tInteger Overflow and Underflow` """
+
+    def __init__(self, label: str):
+        self.label = label
+        parts = label.split(None, 1)
+        self.id = parts[0].rstrip(".")
+        self.title = parts[1] if len(parts) > 1 else ""
+
+
+class TestItem(Heading):
+    def __init__(self, label: str, detectors: List[str]):
+        super().__init__(label)
+        self.detectors = detectors
+        self.findings: List[Finding] = []
+
+    @property
+    def status(self) -> ItemStatus:
+        if len(self.detectors) == 0:
+            return ItemStatus.UNSUPPORTED
+        if len(self.findings) == 0:
+            return ItemStatus.NO_ISSUE
+        return ItemStatus.FOUND
+
+
+class TestGroup(Heading):
+    def __init__(self, label: str):
+        super().__init__(label)
+        self.items: List[TestItem] = []
+
+
+class Section(Heading):
+    def __init__(self, label: str):
+        super().__init__(label)
+        self.groups: List[TestGroup] = []
+
+    def items(self) -> Iterator[TestItem]:
+        for group in self.groups:
+            yield from group.items
+
+    @property
+    def count(self) -> int:
+        """ Issues to address: the findings, and the items to audit manually """
+        return sum(
+            1 if item.status == ItemStatus.UNSUPPORTED else len(item.findings)
+            for item in self.items()
+        )
+
+
+class Checklist:
+    def __init__(self):
+        self.sections: List[Section] = []
+        self.findings: List[Finding] = []
+
+
+def finding_descriptions(result: Dict) -> Iterator[str]:
+    """ The lines of the description of a detector result pointing to the code """
+    for line in result["description"].split("\n"):
+        if len(line) == 0:
+            continue
+        line = _BULLET.sub("", line.lstrip())
+        if "#" in line:
+            yield line
+
+
+def build_checklist(standards: List, detectorMap: Dict[str, List[Dict]], release: Optional[Callable[[str], None]] = None) -> Checklist:
+    """
+    `standards` in the layout of STANDARD_ISSUES, `detectorMap` the results of the detectors by ARGUMENT.
+    `release` is called with an ARGUMENT once the last item using its results is built.
+    """
+    remaining = Counter(arg for standard in standards for testing in standard[1:] for issue in testing[1:] for arg in issue[1])
+    checklist = Checklist()
+    for standard in standards:
+        section = Section(standard[0])
+        for testing in standard[1:]:
+            group = TestGroup(testing[0])
+            for issue in testing[1:]:
+                item = TestItem(issue[0], issue[1])
+                for arg in item.detectors:
+                    for result in detectorMap[arg]:
+                        for description in finding_descriptions(result):
+                            finding = Finding(len(checklist.findings) + 1, item, description)
+                            item.findings.append(finding)
+                            checklist.findings.append(finding)
+                    remaining[arg] -= 1
+                    if release is not None and remaining[arg] == 0:
+                        release(arg)
+                group.items.append(item)
+            section.groups.append(group)
+        checklist.sections.append(section)
+    return checklist
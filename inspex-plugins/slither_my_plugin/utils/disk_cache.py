@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Set
+from weakref import WeakKeyDictionary
+from slither.core.compilation_unit import SlitherCompilationUnit
+from slither.core.declarations import Contract
+from slither.detectors.abstract_detector import AbstractDetector
+import slither_my_plugin
+from slither_my_plugin.utils.instrumentation import record_cache
+
+try:
+    from importlib import metadata
+except ImportError: # Python < 3.8
+    metadata = None
+
+_plugin_version: Optional[str] = None
+_file_hashes: "WeakKeyDictionary[SlitherCompilationUnit, Dict[str, str]]" = WeakKeyDictionary()
+_fingerprints: "WeakKeyDictionary[Contract, str]" = WeakKeyDictionary()
+
+
+def plugin_version() -> str:
+    """ Hash of the plugin sources and of the slither version, any change of the detectors invalidates the cache """
+    global _plugin_version
+    if _plugin_version is None:
+        h = hashlib.sha256()
+        if metadata is not None:
+            try:
+                h.update(metadata.version("slither-analyzer").encode())
+            except metadata.PackageNotFoundError:
+                pass
+        root = os.path.dirname(slither_my_plugin.__file__)
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.endswith(".py"):
+                    with open(os.path.join(dirpath, name), "rb") as f:
+                        h.update(name.encode())
+                        h.update(f.read())
+        _plugin_version = h.hexdigest()
+    return _plugin_version
+
+
+def _file_hash(compilation_unit: SlitherCompilationUnit, filename: str) -> str:
+    if compilation_unit not in _file_hashes:
+        _file_hashes[compilation_unit] = {}
+    hashes = _file_hashes[compilation_unit]
+    if filename not in hashes:
+        source = compilation_unit.core.source_code.get(filename, "")
+        hashes[filename] = hashlib.sha256(source.encode("utf8")).hexdigest()
+    return hashes[filename]
+
+
+def _scope_files(contract: Contract) -> Set[str]:
+    """ Files the contract can see: its own, every file imported transitively, and the files of its parents """
+    files = {contract.source_mapping.filename.absolute}
+    for c in contract.inheritance:
+        files.add(c.source_mapping.filename.absolute)
+    seen = set()
+    scopes = [contract.file_scope]
+    while scopes:
+        scope = scopes.pop()
+        if id(scope) in seen:
+            continue
+        seen.add(id(scope))
+        files.add(scope.filename.absolute)
+        scopes += scope.accessible_scopes
+    return files
+
+
+def contract_fingerprint(contract: Contract) -> str:
+    """
+    Hash of the files the contract can see, parents and imports included, free functions and pragmas as well.
+    Whole files are hashed since the results hold line numbers, a change above the contract moves them too.
+    The contracts inheriting from it are part of the key, most detectors only analyze the contracts that have none.
+    """
+    if contract not in _fingerprints:
+        h = hashlib.sha256(contract.name.encode())
+        for child in sorted(c.name for c in contract.derived_contracts):
+            h.update(b"child:" + child.encode())
+        for f in sorted(_scope_files(contract)):
+            h.update(f.encode())
+            h.update(_file_hash(contract.compilation_unit, f).encode())
+        _fingerprints[contract] = h.hexdigest()
+    return _fingerprints[contract]
+
+
+def unit_fingerprint(compilation_unit: SlitherCompilationUnit) -> str:
+    """ Hash of every source file, those without any contract included """
+    h = hashlib.sha256()
+    for f in sorted(compilation_unit.core.source_code):
+        h.update(f.encode())
+        h.update(_file_hash(compilation_unit, f).encode())
+    return h.hexdigest()
+
+
+def cache_path(cache_dir: str, detector: AbstractDetector, contracts: Optional[List[Contract]]) -> str:
+    """ Path of the results of a PER_CONTRACT detector on `contracts`, or of another detector on the whole unit when None """
+    compilation_unit = detector.compilation_unit
+    if contracts is None:
+        sources = [unit_fingerprint(compilation_unit)]
+    else:
+        sources = [contract_fingerprint(c) for c in contracts]
+    key = [
+        detector.ARGUMENT,
+        plugin_version(),
+        compilation_unit.compiler_version.version,
+        detector.cacheSettings(),
+        sources,
+    ]
+    digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+    return os.path.join(cache_dir, detector.ARGUMENT, digest + ".json")
+
+
+def load_results(path: str) -> Optional[List[Dict]]:
+    try:
+        with open(path, encoding="utf8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_results(path: str, results: List[Dict]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Written aside then renamed, the workers of a parallel run may store at the same time
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    try:
+        with open(tmp, "w", encoding="utf8") as f:
+            json.dump(results, f)
+        os.replace(tmp, path)
+    except (OSError, TypeError): # The cache is best effort, the results are still returned
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def detect_with_disk_cache(detector: AbstractDetector, cache_dir: str) -> List[Dict]:
+    """
+    detect() of the detector, reusing the results of the unchanged contracts stored in `cache_dir`.
+    PER_CONTRACT detectors are cached per contract, the others per compilation unit.
+    The stored results are the ones of _detect(), filtering and deduplication are applied on every run as detect() does.
+    """
+    if not detector._is_applicable_detector():
+        return []
+    compilation_unit = detector.compilation_unit
+    if detector.PER_CONTRACT:
+        units = [[c] for c in detector.shardContracts(compilation_unit.contracts)]
+    else:
+        units = [None]
+
+    shard = detector.contractShard
+    found = []
+    try:
+        for contracts in units:
+            path = cache_path(cache_dir, detector, contracts)
+            results = load_results(path)
+            record_cache(detector.ARGUMENT, "disk_misses" if results is None else "disk_hits")
+            if results is None:
+                if contracts is not None:
+                    detector.contractShard = set(contracts)
+                results = [output.data for output in detector._detect()]
+                store_results(path, results)
+            found += results
+    finally:
+        detector.contractShard = shard
+
+    # valid_result() also drops the ids already reported, e.g. by the contracts of two units
+    core = compilation_unit.core
+    return sorted((r for r in found if core.valid_result(r)), key=lambda x: x["id"])
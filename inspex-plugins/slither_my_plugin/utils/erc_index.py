@@ -0,0 +1,76 @@
+from typing import Dict, FrozenSet, List, Tuple
+from weakref import WeakKeyDictionary
+from slither.core.declarations import Contract
+from slither.utils.erc import (
+    ERC20_signatures,
+    ERC165_signatures,
+    ERC223_signatures,
+    ERC721_signatures,
+    ERC1820_signatures,
+    ERC777_signatures,
+    ERC1155_signatures,
+    ERC2612_signatures,
+    ERC1363_signatures,
+    ERC4524_signatures,
+    ERC4626_signatures,
+)
+
+# Standard -> required signatures, in the order they are reported
+STANDARDS: List[Tuple[str, List[str]]] = [
+    ("ERC20", ERC20_signatures),
+    ("ERC165", ERC165_signatures),
+    ("ERC1820", ERC1820_signatures),
+    ("ERC223", ERC223_signatures),
+    ("ERC721", ERC721_signatures),
+    ("ERC777", ERC777_signatures),
+    ("ERC1155", ERC1155_signatures),
+    ("ERC2612", ERC2612_signatures),
+    ("ERC1363", ERC1363_signatures),
+    ("ERC4524", ERC4524_signatures),
+    ("ERC4626", ERC4626_signatures),
+]
+# The standards Contract.ercs() reports once all their signatures are there, in its order
+DETECTED_STANDARDS = ["ERC20", "ERC165", "ERC1820", "ERC223", "ERC721", "ERC777", "ERC2612", "ERC1363", "ERC4626"]
+
+
+def _signature_index() -> Dict[str, int]:
+    """ Signature -> bitmask of the standards requiring it, bit i for STANDARDS[i] """
+    index: Dict[str, int] = {}
+    for bit, (_, signatures) in enumerate(STANDARDS):
+        for s in set(signatures):
+            index[s] = index.get(s, 0) | 1 << bit
+    return index
+
+
+SIGNATURE_INDEX = _signature_index()
+STANDARD_SIZES = [len(set(signatures)) for _, signatures in STANDARDS]
+
+_signatures: "WeakKeyDictionary[Contract, FrozenSet[str]]" = WeakKeyDictionary()
+_matches: "WeakKeyDictionary[Contract, Tuple[int, ...]]" = WeakKeyDictionary()
+
+
+def contract_signatures(contract: Contract) -> FrozenSet[str]:
+    """ Signatures of the public and external functions and state variables of the contract, inherited ones included """
+    if contract not in _signatures:
+        _signatures[contract] = frozenset(contract.functions_signatures)
+    return _signatures[contract]
+
+
+def erc_matches(contract: Contract) -> Tuple[int, ...]:
+    """ Number of signatures of every standard of STANDARDS the contract has, in a single pass over its signatures """
+    if contract not in _matches:
+        counts = [0] * len(STANDARDS)
+        for s in contract_signatures(contract):
+            mask = SIGNATURE_INDEX.get(s, 0)
+            while mask:
+                low = mask & -mask
+                counts[low.bit_length() - 1] += 1
+                mask ^= low
+        _matches[contract] = tuple(counts)
+    return _matches[contract]
+
+
+def implemented_ercs(contract: Contract) -> List[str]:
+    """ Same as Contract.ercs(), from the index """
+    complete = {name for (name, _), found, size in zip(STANDARDS, erc_matches(contract), STANDARD_SIZES) if found == size}
+    return [name for name in DETECTED_STANDARDS if name in complete]
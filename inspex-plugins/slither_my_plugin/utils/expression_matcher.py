@@ -0,0 +1,90 @@
+from typing import Callable, Iterator, List, Optional
+from slither.core.declarations import SolidityFunction, SolidityVariable
+from slither.core.expressions import (
+    AssignmentOperation,
+    BinaryOperation,
+    CallExpression,
+    ConditionalExpression,
+    IndexAccess,
+    MemberAccess,
+    TupleExpression,
+    TypeConversion,
+    UnaryOperation,
+)
+from slither.core.expressions.expression import Expression
+from slither.core.expressions.identifier import Identifier
+from slither.core.variables.variable import Variable
+
+
+def sub_expressions(expression: Expression) -> List[Expression]:
+    """ Direct children of the expression """
+    if isinstance(expression, CallExpression):
+        children = [expression.called] + list(expression.arguments)
+        children += [expression.call_value, expression.call_gas, expression.call_salt]
+    elif isinstance(expression, ConditionalExpression):
+        children = [expression.if_expression, expression.then_expression, expression.else_expression]
+    elif isinstance(expression, (AssignmentOperation, BinaryOperation, IndexAccess, TupleExpression)):
+        children = list(expression.expressions)
+    elif isinstance(expression, (MemberAccess, TypeConversion, UnaryOperation)):
+        children = [expression.expression]
+    else:
+        children = []
+    # Tuples can have empty components, e.g. (, uint a) = f()
+    return [e for e in children if e is not None]
+
+
+def walk(expression: Optional[Expression]) -> Iterator[Expression]:
+    """ The expression and all its sub-expressions, depth first """
+    stack = [] if expression is None else [expression]
+    while stack:
+        e = stack.pop()
+        yield e
+        stack.extend(reversed(sub_expressions(e)))
+
+
+def contains(expression: Optional[Expression], predicate: Callable[[Expression], bool]) -> bool:
+    return any(predicate(e) for e in walk(expression))
+
+
+def is_variable(expression: Expression, variable: Variable) -> bool:
+    return isinstance(expression, Identifier) and expression.value == variable
+
+
+def references_variable(expression: Optional[Expression], variable: Variable) -> bool:
+    return contains(expression, lambda e: is_variable(e, variable))
+
+
+def is_solidity_variable(expression: Expression, name: str) -> bool:
+    """ e.g. `this` or `msg.sender`, the parser turns both into identifiers """
+    return (
+        isinstance(expression, Identifier)
+        and isinstance(expression.value, SolidityVariable)
+        and expression.value.name == name
+    )
+
+
+def references_msg_sender(expression: Optional[Expression]) -> bool:
+    return contains(expression, lambda e: is_solidity_variable(e, "msg.sender"))
+
+
+def is_solidity_call(expression: Expression, *names: str) -> bool:
+    """ Call to one of the built-in functions, `names` are given without the signature, e.g. `require` """
+    return (
+        isinstance(expression, CallExpression)
+        and isinstance(expression.called, Identifier)
+        and isinstance(expression.called.value, SolidityFunction)
+        and expression.called.value.name.split("(")[0] in names
+    )
+
+
+def calls_solidity_function(expression: Optional[Expression], *names: str) -> bool:
+    return contains(expression, lambda e: is_solidity_call(e, *names))
+
+
+def is_this_member(expression: Expression) -> bool:
+    """ `this.f`, the external call or the getter of the contract itself """
+    return isinstance(expression, MemberAccess) and is_solidity_variable(expression.expression, "this")
+
+
+def uses_this(expression: Optional[Expression]) -> bool:
+    return contains(expression, is_this_member)
@@ -0,0 +1,237 @@
+import atexit
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple
+from weakref import WeakKeyDictionary
+from slither.core.declarations import Contract
+from slither.detectors.abstract_detector import AbstractDetector
+from slither_my_plugin.utils.plugin_config import get_metrics_file, get_trace_memory
+
+# ARGUMENT -> counters, summed over the compilation units and the parallel workers
+_detectors: Dict[str, Dict] = {}
+_printers: Dict[str, Dict] = {}
+_code_sizes: "WeakKeyDictionary[Contract, Tuple[int, int]]" = WeakKeyDictionary()
+# Detectors being timed, a nested detect_with_cache() of the same detector is not counted twice
+_running: Set[int] = set()
+# [memory at the start, highest peak seen] of the blocks being traced, innermost last
+_memory: List[List[int]] = []
+# Memory traced before the last restart of tracemalloc, on Python < 3.9 which has no reset_peak()
+_memory_offset = 0
+_registered = False
+
+
+def metrics_enabled() -> bool:
+    return get_metrics_file() is not None
+
+
+def _clock() -> Tuple[float, float]:
+    return time.perf_counter(), time.process_time()
+
+
+def _add(target: Dict, values: Dict):
+    """ Sum the numbers of `values` into `target`, nested dicts included. Peaks keep the highest value """
+    for key, value in values.items():
+        if isinstance(value, dict):
+            _add(target.setdefault(key, {}), value)
+        elif key == "peak_memory_kb":
+            target[key] = max(target.get(key, 0), value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+def _traced_memory() -> Tuple[int, int]:
+    current, peak = tracemalloc.get_traced_memory()
+    return current + _memory_offset, peak + _memory_offset
+
+
+def _reset_peak():
+    global _memory_offset
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+        return
+    # Restarting clears the peak but also forgets the blocks traced so far, they are kept as an offset
+    _memory_offset += tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracemalloc.start()
+
+
+def _memory_start():
+    """
+    Start tracing the peak of a block. tracemalloc has a single peak counter,
+    it is folded into the enclosing block before being reset for the inner one.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    peak = _traced_memory()[1]
+    if _memory:
+        _memory[-1][1] = max(_memory[-1][1], peak)
+    _reset_peak()
+    current = _traced_memory()[0]
+    _memory.append([current, current])
+
+
+def _memory_end() -> float:
+    """ Peak in KiB allocated above the memory in use when the block started """
+    peak = _traced_memory()[1]
+    start, seen = _memory.pop()
+    peak = max(peak, seen)
+    if _memory:
+        _memory[-1][1] = max(_memory[-1][1], peak)
+    _reset_peak()
+    return (peak - start) / 1024
+
+
+def _register_report():
+    global _registered
+    if not _registered:
+        _registered = True
+        atexit.register(write_metrics)
+
+
+def _detector_entry(argument: str) -> Dict:
+    _register_report()
+    if argument not in _detectors:
+        _detectors[argument] = {
+            "runs": 0,
+            "wall_s": 0.0,
+            "cpu_s": 0.0,
+            "findings": 0,
+            "nodes": 0,
+            "irs": 0,
+            "cache": {"memory_hits": 0, "disk_hits": 0, "disk_misses": 0},
+            "contracts": {},
+        }
+    return _detectors[argument]
+
+
+def code_size(contract: Contract) -> Tuple[int, int]:
+    """ CFG nodes and IRs of the functions and modifiers of the contract """
+    if contract not in _code_sizes:
+        nodes = irs = 0
+        for f in contract.functions_and_modifiers:
+            nodes += len(f.nodes)
+            irs += sum(len(n.irs) for n in f.nodes)
+        _code_sizes[contract] = (nodes, irs)
+    return _code_sizes[contract]
+
+
+def record_cache(argument: str, kind: str, count: int = 1):
+    """ `kind` is memory_hits, disk_hits or disk_misses """
+    if metrics_enabled():
+        _detector_entry(argument)["cache"][kind] += count
+
+
+def timed_detect(detector: AbstractDetector, detect: Callable[[], List[Dict]]) -> Callable[[], List[Dict]]:
+    """
+    `detect` recording its wall and CPU time and the findings of the detector, and its peak memory with INSPEX_TRACE_MEMORY.
+    The detectors iterating targetContracts() count the code of the contracts they analyzed, the others the whole compilation unit.
+    """
+    if not metrics_enabled():
+        return detect
+
+    def run() -> List[Dict]:
+        if id(detector) in _running:
+            return detect()
+        _running.add(id(detector))
+        traced = get_trace_memory()
+        if traced:
+            _memory_start()
+        wall, cpu = _clock()
+        try:
+            results = detect()
+        finally:
+            _running.discard(id(detector))
+            peak = _memory_end() if traced else None
+        end_wall, end_cpu = _clock()
+        values = {"runs": 1, "wall_s": end_wall - wall, "cpu_s": end_cpu - cpu, "findings": len(results)}
+        if peak is not None:
+            values["peak_memory_kb"] = peak
+        if not getattr(detector, "PER_CONTRACT", False):
+            for c in detector.compilation_unit.contracts:
+                nodes, irs = code_size(c)
+                _add(values, {"nodes": nodes, "irs": irs})
+        _add(_detector_entry(detector.ARGUMENT), values)
+        return results
+
+    return run
+
+
+def timed_contracts(detector: AbstractDetector, contracts: List[Contract]) -> Iterable[Contract]:
+    """ The contracts, the time spent on each one by the loop body is recorded when metrics are enabled """
+    if not metrics_enabled():
+        return contracts
+    return _timed_contracts(_detector_entry(detector.ARGUMENT), contracts)
+
+
+def _timed_contracts(entry: Dict, contracts: List[Contract]) -> Iterator[Contract]:
+    for c in contracts:
+        wall, cpu = _clock()
+        try:
+            yield c
+        finally:
+            end_wall, end_cpu = _clock()
+            nodes, irs = code_size(c)
+            _add(entry, {"nodes": nodes, "irs": irs})
+            _add(entry["contracts"].setdefault(c.name, {}), {
+                "wall_s": end_wall - wall,
+                "cpu_s": end_cpu - cpu,
+                "nodes": nodes,
+                "irs": irs,
+            })
+
+
+@contextmanager
+def timed_phase(argument: str, phase: str):
+    """ Time of a phase of a printer, e.g. running the detectors or rendering, and its peak memory with INSPEX_TRACE_MEMORY """
+    if not metrics_enabled():
+        yield
+        return
+    _register_report()
+    traced = get_trace_memory()
+    if traced:
+        _memory_start()
+    wall, cpu = _clock()
+    try:
+        yield
+    finally:
+        end_wall, end_cpu = _clock()
+        values = {"wall_s": end_wall - wall, "cpu_s": end_cpu - cpu}
+        if traced:
+            values["peak_memory_kb"] = _memory_end()
+        entry = _printers.setdefault(argument, {"phases": {}})
+        _add(entry["phases"].setdefault(phase, {}), values)
+
+
+def take_metrics() -> Dict:
+    """ Counters recorded since the last call, cleared. Used by the parallel workers to send theirs with the results """
+    global _detectors, _printers
+    snapshot = {"detectors": _detectors, "printers": _printers}
+    _detectors = {}
+    _printers = {}
+    return snapshot
+
+
+def merge_metrics(snapshot: Dict):
+    for argument, values in snapshot.get("detectors", {}).items():
+        _add(_detector_entry(argument), values)
+    for argument, values in snapshot.get("printers", {}).items():
+        _add(_printers.setdefault(argument, {"phases": {}}), values)
+
+
+def metrics_report() -> Dict:
+    detectors = {}
+    for argument, entry in sorted(_detectors.items()):
+        entry = dict(entry)
+        entry["contracts"] = dict(sorted(entry["contracts"].items(), key=lambda c: -c[1]["wall_s"]))
+        detectors[argument] = entry
+    return {"detectors": detectors, "printers": dict(sorted(_printers.items()))}
+
+
+def write_metrics():
+    path = get_metrics_file()
+    if path is None or not (_detectors or _printers):
+        return
+    with open(path, "w", encoding="utf8") as f:
+        json.dump(metrics_report(), f, indent=2)
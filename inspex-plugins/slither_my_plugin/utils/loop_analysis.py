@@ -0,0 +1,192 @@
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Set
+from weakref import WeakKeyDictionary
+from slither.core.cfg.node import Node, NodeType
+from slither.core.declarations import Function
+from slither.core.expressions import BinaryOperation, IndexAccess, Literal, MemberAccess, TypeConversion
+from slither.core.expressions.expression import Expression
+from slither.core.expressions.identifier import Identifier
+from slither.core.solidity_types import MappingType
+from slither.core.variables.local_variable import LocalVariable
+from slither.core.variables.state_variable import StateVariable
+from slither.core.variables.variable import Variable
+from slither_my_plugin.utils.expression_matcher import is_solidity_call
+
+
+class LoopBound(Enum):
+    CONSTANT = "constant"
+    PARAMETER = "parameter"
+    STORAGE_ARRAY_LENGTH = "storage array length"
+    MEMORY_ARRAY_LENGTH = "memory array length"
+    MAPPING = "mapping"
+    UNKNOWN = "unknown"
+
+
+# Bounds growing with the data of the contract or of the caller
+DATA_DEPENDENT_BOUNDS = frozenset([LoopBound.STORAGE_ARRAY_LENGTH, LoopBound.MEMORY_ARRAY_LENGTH, LoopBound.MAPPING])
+
+
+class Loop:
+    """
+    A loop statement of a function.
+    `start` and `end` are the BEGIN_LOOP and END_LOOP nodes, `header` the IF_LOOP node evaluating the condition.
+    The body holds every node executed inside the loop, nested loops included, but not `start` and `end`.
+    """
+
+    def __init__(self, start: Node, end: Optional[Node], body: Set[Node]):
+        self.start = start
+        self.end = end
+        self.body = body
+        self.header: Optional[Node] = None
+        self.parent: Optional["Loop"] = None
+        self.children: List["Loop"] = []
+        self.depth = 1
+        self._bound: Optional[LoopBound] = None
+        # Nodes of the body leaving the loop: the condition, break, return
+        self.exits: List[Node] = [
+            n for n in self.body_nodes() if n.type == NodeType.RETURN or any(s not in body for s in n.sons)
+        ]
+
+    def body_nodes(self) -> List[Node]:
+        return sorted(self.body, key=lambda n: n.node_id)
+
+    def __contains__(self, node: Node) -> bool:
+        return node in self.body
+
+    @property
+    def bound(self) -> LoopBound:
+        """ What the iterator is compared with in the loop condition, classified on first use """
+        if self._bound is None:
+            self._bound = classify_bound(self)
+        return self._bound
+
+
+class LoopForest:
+    """
+    Loops of a function, nested by body inclusion.
+    A node is inside a loop when it is dominated by the loop's BEGIN_LOOP node
+    but not by the matching END_LOOP node. Both nodes share the source mapping of the loop statement.
+    """
+
+    def __init__(self, function: Function):
+        self.function = function
+        self.loops: List[Loop] = []
+        self.roots: List[Loop] = []
+        self._innermost: Dict[Node, Loop] = {}
+        self.loop_nodes: Set[Node] = set()
+
+        starts = [n for n in function.nodes if n.type == NodeType.STARTLOOP]
+        if not starts:
+            return
+        ends = {}
+        for n in function.nodes:
+            if n.type == NodeType.ENDLOOP:
+                ends[(n.source_mapping.start, n.source_mapping.length)] = n
+        for start in starts:
+            end = ends.get((start.source_mapping.start, start.source_mapping.length))
+            body = set()
+            for node in function.nodes:
+                if node is start or node is end:
+                    continue
+                if start in node.dominators and (end is None or end not in node.dominators):
+                    body.add(node)
+            self.loops.append(Loop(start, end, body))
+
+        # Outer loops first, so the innermost loop of a node is the last one written
+        self.loops.sort(key=lambda l: (-len(l.body), l.start.node_id))
+        for i, loop in enumerate(self.loops):
+            for outer in reversed(self.loops[:i]):
+                if loop.start in outer.body:
+                    loop.parent = outer
+                    loop.depth = outer.depth + 1
+                    outer.children.append(loop)
+                    break
+            if loop.parent is None:
+                self.roots.append(loop)
+            for node in loop.body:
+                self._innermost[node] = loop
+        self.loops.sort(key=lambda l: l.start.node_id)
+        for loop in self.loops:
+            loop.children.sort(key=lambda l: l.start.node_id)
+            headers = [n for n in loop.body_nodes() if n.type == NodeType.IFLOOP and self._innermost[n] is loop]
+            loop.header = headers[0] if headers else None
+        self.roots.sort(key=lambda l: l.start.node_id)
+        self.loop_nodes = set(self._innermost)
+
+    def loop_of(self, node: Node) -> Optional[Loop]:
+        """ Innermost loop containing the node """
+        return self._innermost.get(node)
+
+
+def _root_variable(expression: Expression) -> Optional[Variable]:
+    """ `users` for `users[i].orders`, None when the expression is not a variable access """
+    while isinstance(expression, (IndexAccess, MemberAccess, TypeConversion)):
+        expression = expression.expressions[0] if isinstance(expression, IndexAccess) else expression.expression
+    if isinstance(expression, Identifier) and isinstance(expression.value, Variable):
+        return expression.value
+    return None
+
+
+def _array_length_bound(array: Expression) -> LoopBound:
+    root = _root_variable(array)
+    if root is not None and isinstance(root.type, MappingType):
+        return LoopBound.MAPPING
+    if isinstance(root, StateVariable) or (isinstance(root, LocalVariable) and root.is_storage):
+        return LoopBound.STORAGE_ARRAY_LENGTH
+    return LoopBound.MEMORY_ARRAY_LENGTH
+
+
+def classify_expression_bound(expression: Expression, function: Function) -> LoopBound:
+    while isinstance(expression, TypeConversion):
+        expression = expression.expression
+    if isinstance(expression, Literal):
+        return LoopBound.CONSTANT
+    if isinstance(expression, MemberAccess) and expression.member_name == "length":
+        return _array_length_bound(expression.expression)
+    if is_solidity_call(expression, "len"): # Vyper
+        return _array_length_bound(expression.arguments[0])
+    root = _root_variable(expression)
+    if root is not None and isinstance(root.type, MappingType):
+        return LoopBound.MAPPING
+    if isinstance(expression, Identifier):
+        if isinstance(root, StateVariable) and (root.is_constant or root.is_immutable):
+            return LoopBound.CONSTANT
+        if root in function.parameters:
+            return LoopBound.PARAMETER
+    return LoopBound.UNKNOWN
+
+
+def classify_bound(loop: Loop) -> LoopBound:
+    if loop.header is None or not isinstance(loop.header.expression, BinaryOperation):
+        return LoopBound.UNKNOWN
+    iterator, bound = loop.header.expression.expressions
+    # The iterator is the operand written in the loop, e.g. `i < n` or `n > i`
+    written = set()
+    for n in loop.body:
+        written.update(n.variables_written)
+    if _root_variable(bound) in written and _root_variable(iterator) not in written:
+        bound = iterator
+    return classify_expression_bound(bound, loop.start.function)
+
+
+def loop_bound_fields(loops: Iterable[Loop]) -> Dict:
+    """ additional_fields of a detector result, the bounds of the loops it reports """
+    return {
+        "loop_bounds": [
+            {
+                "function": loop.start.function.canonical_name,
+                "lines": loop.start.source_mapping.lines,
+                "bound": loop.bound.value,
+            }
+            for loop in loops
+        ]
+    }
+
+
+_forests: "WeakKeyDictionary[Function, LoopForest]" = WeakKeyDictionary()
+
+
+def get_loop_forest(function: Function) -> LoopForest:
+    if function not in _forests:
+        _forests[function] = LoopForest(function)
+    return _forests[function]
@@ -0,0 +1,37 @@
+from typing import Dict, List
+from slither.core.declarations import Contract
+from slither.detectors.abstract_detector import AbstractDetector
+
+# What the checklist renders of a result, the elements and their source mappings are the bulk of the rest
+RENDERED_FIELDS = ["id", "check", "impact", "confidence", "description"]
+
+
+def contract_batches(contracts: List[Contract], size: int) -> List[List[Contract]]:
+    return [contracts[i:i + size] for i in range(0, len(contracts), size)]
+
+
+def detect_in_batches(detector: AbstractDetector, size: int) -> List[Dict]:
+    """
+    detect() of a PER_CONTRACT detector, running _detect() on `size` contracts at a time.
+    The intermediate lists of a batch and its Output objects are released before the next batch starts,
+    only the JSON of the results is kept. Filtering and deduplication are applied as detect() does.
+    """
+    if not detector._is_applicable_detector():
+        return []
+    shard = detector.contractShard
+    found = []
+    try:
+        for contracts in contract_batches(detector.shardContracts(detector.compilation_unit.contracts), size):
+            detector.contractShard = set(contracts)
+            found += [output.data for output in detector._detect()]
+    finally:
+        detector.contractShard = shard
+
+    # valid_result() keeps the set of the ids already reported, the same result from two batches is dropped there
+    core = detector.compilation_unit.core
+    return sorted((r for r in found if core.valid_result(r)), key=lambda x: x["id"])
+
+
+def compact_results(results: List[Dict]) -> List[Dict]:
+    """ The results with only the fields rendered by the checklist """
+    return [{k: r[k] for k in RENDERED_FIELDS if k in r} for r in results]
@@ -0,0 +1,73 @@
+import sys
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, TextIO, Union
+
+
+class OutputSink(ABC):
+    """ Destination of the lines of a printer, written one at a time as they are produced """
+
+    @abstractmethod
+    def write(self, line: str):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class StreamSink(OutputSink):
+    """ Lines written to a text stream, stdout by default. The stream is not closed, only flushed """
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = sys.stdout if stream is None else stream
+
+    def write(self, line: str):
+        self.stream.write(line + "\n")
+
+    def flush(self):
+        self.stream.flush()
+
+
+class FileSink(StreamSink):
+    def __init__(self, path: str, newline: Optional[str] = None):
+        self.path = path
+        super().__init__(open(path, "w", encoding="utf8", newline=newline))
+
+    def close(self):
+        self.stream.close()
+
+
+class CallbackSink(OutputSink):
+    """ Every line given to `callback`, e.g. to forward the report to a logger or a socket """
+
+    def __init__(self, callback: Callable[[str], None]):
+        self.callback = callback
+
+    def write(self, line: str):
+        self.callback(line)
+
+
+class BufferSink(OutputSink):
+    """ Lines kept in memory, for the printers needing the whole report before writing it """
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def write(self, line: str):
+        self.lines.append(line)
+
+    def getvalue(self) -> str:
+        return "".join(line + "\n" for line in self.lines)
+
+
+def open_sink(target: Union[None, str, Callable[[str], None], OutputSink]) -> OutputSink:
+    """ Sink of a target: None or `-` for stdout, a file path, a callback or an existing sink """
+    if target is None or target == "-":
+        return StreamSink()
+    if isinstance(target, OutputSink):
+        return target
+    if isinstance(target, str):
+        return FileSink(target)
+    return CallbackSink(target)
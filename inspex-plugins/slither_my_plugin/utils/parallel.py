@@ -0,0 +1,114 @@
+import heapq
+import os
+from typing import Dict, List, Optional, Tuple
+from slither.core.declarations import Contract
+from slither.detectors.abstract_detector import AbstractDetector
+from slither_my_plugin.utils.result_cache import get_cached_results, cache_results, detect_with_cache, forget_results
+from slither_my_plugin.utils.instrumentation import merge_metrics, take_metrics
+from slither_my_plugin.utils.profiling import profiling_enabled, reset_profiles, write_profiles
+
+# Set right before forking, the workers inherit the parsed compilation units copy-on-write instead of unpickling them
+_pending: List[AbstractDetector] = []
+_shards: Dict[int, List[List[Contract]]] = {}
+_in_worker = False
+
+
+def can_fork() -> bool:
+    import multiprocessing # Not imported with the plugin, only when a parallel run is asked
+    return not _in_worker and "fork" in multiprocessing.get_all_start_methods()
+
+
+def contract_weight(contract: Contract) -> int:
+    """ Estimated cost of analyzing the contract, its number of CFG nodes """
+    return 1 + sum(len(f.nodes) for f in contract.functions_and_modifiers)
+
+
+def partition_contracts(contracts: List[Contract], count: int) -> List[List[Contract]]:
+    """
+    Split the contracts into at most `count` shards of similar weight,
+    the heaviest contract goes to the lightest shard first (longest processing time).
+    """
+    count = min(count, len(contracts))
+    if count <= 1:
+        return [list(contracts)]
+    heap: List[Tuple[int, int]] = [(0, i) for i in range(count)]
+    shards: List[List[Contract]] = [[] for _ in range(count)]
+    for c in sorted(contracts, key=lambda c: (-contract_weight(c), c.id)):
+        weight, i = heapq.heappop(heap)
+        shards[i].append(c)
+        heapq.heappush(heap, (weight + contract_weight(c), i))
+    return shards
+
+
+def _run_detector(task: Tuple[int, Optional[int]]):
+    global _in_worker
+    if not _in_worker and profiling_enabled(): # First task of this worker
+        reset_profiles()
+    _in_worker = True
+    i, shard = task
+    d = _pending[i]
+    d.logger = None
+    d.contractShard = None if shard is None else set(_shards[i][shard])
+    # A worker runs several shards of the same detector, do not return the results of the previous one
+    forget_results(d.compilation_unit, d.ARGUMENT)
+    take_metrics() # Drop the counters inherited from the parent or left by the previous task
+    results = detect_with_cache(d)
+    # Workers do not run the exit handlers, each one writes its profiles under its process id
+    write_profiles(".%d" % os.getpid())
+    return task, results, take_metrics()
+
+
+def run_detectors_in_parallel(detectors: List[AbstractDetector], jobs: int):
+    """
+    Run the detectors that are not cached yet across `jobs` forked processes.
+    The detectors with PER_CONTRACT set are also split into shards of contracts, balanced by node count.
+    The results come back as the detect() JSON and are stored in the result cache in the order of `detectors`,
+    so the output does not depend on which worker finished first.
+    """
+    global _pending, _shards
+    pending = []
+    seen = set()
+    for d in detectors:
+        key = (id(d.compilation_unit), d.ARGUMENT)
+        if key in seen or get_cached_results(d.compilation_unit, d.ARGUMENT) is not None:
+            continue
+        seen.add(key)
+        pending.append(d)
+    if jobs <= 1 or not can_fork():
+        return
+    if any(d.slither.triage_mode for d in pending): # Triage needs the terminal
+        return
+
+    shards = {}
+    tasks = []
+    for i, d in enumerate(pending):
+        if getattr(d, "PER_CONTRACT", False):
+            shards[i] = partition_contracts(d.compilation_unit.contracts, jobs)
+            tasks += [(i, s) for s in range(len(shards[i]))]
+        else:
+            tasks.append((i, None))
+    if len(tasks) <= 1:
+        return
+
+    import multiprocessing
+    _pending = pending
+    _shards = shards
+    try:
+        with multiprocessing.get_context("fork").Pool(min(jobs, len(tasks))) as pool:
+            outputs: Dict[Tuple[int, Optional[int]], List[Dict]] = {}
+            for task, results, metrics in pool.imap_unordered(_run_detector, tasks):
+                outputs[task] = results
+                merge_metrics(metrics)
+    finally:
+        _pending = []
+        _shards = {}
+
+    for i, d in enumerate(pending):
+        # The workers marked the result ids as seen on their own copy of the core, replay it here.
+        # Merged shards are sorted by id again, as detect() does on a serial run
+        core = d.compilation_unit.core
+        results = []
+        for task in tasks:
+            if task[0] == i:
+                results += [r for r in outputs[task] if core.valid_result(r)]
+        cache_results(d.compilation_unit, d.ARGUMENT, sorted(results, key=lambda x: x["id"]))
@@ -0,0 +1,110 @@
+import os
+from typing import List, Optional
+
+# Slither does not let plugins add command line flags, so the plugin options are read from the environment.
+CHECKLIST_SECTIONS = "INSPEX_CHECKLIST_SECTIONS"
+JOBS = "INSPEX_JOBS"
+CACHE_DIR = "INSPEX_CACHE_DIR"
+RESULTS_FILE = "INSPEX_RESULTS_FILE"
+CHECKLIST_OUTPUT = "INSPEX_CHECKLIST_OUTPUT"
+XLSX_FILE = "INSPEX_XLSX_FILE"
+CSV_FILE = "INSPEX_CSV_FILE"
+METRICS_FILE = "INSPEX_METRICS_FILE"
+PROFILE_DIR = "INSPEX_PROFILE_DIR"
+TRACE_MEMORY = "INSPEX_TRACE_MEMORY"
+MEMORY_BUDGET = "INSPEX_MEMORY_BUDGET"
+
+
+def get_env_list(name: str) -> Optional[List[str]]:
+    """ Comma separated values of the variable, or None if it is not set """
+    value = os.environ.get(name, "").strip()
+    if value == "":
+        return None
+    return [v.strip() for v in value.split(",") if v.strip() != ""]
+
+
+def get_checklist_sections() -> Optional[List[str]]:
+    """ e.g. INSPEX_CHECKLIST_SECTIONS=5,8.1 """
+    sections = get_env_list(CHECKLIST_SECTIONS)
+    if sections is None:
+        return None
+    return [s.rstrip(".") for s in sections]
+
+
+def get_jobs() -> int:
+    """ Number of worker processes for the detectors, `0` or `auto` for one per CPU. Defaults to 1 (serial) """
+    value = os.environ.get(JOBS, "").strip().lower()
+    if value == "":
+        return 1
+    if value in ["0", "auto"]:
+        return os.cpu_count() or 1
+    return max(1, int(value))
+
+
+def get_cache_dir() -> Optional[str]:
+    """ Directory of the on-disk detector results, None to disable the cache """
+    value = os.environ.get(CACHE_DIR, "").strip()
+    if value == "":
+        return None
+    return os.path.expanduser(value)
+
+
+def get_results_file() -> Optional[str]:
+    """ File the checklist printers save the detector results to, None to not save them """
+    value = os.environ.get(RESULTS_FILE, "").strip()
+    if value == "":
+        return None
+    return os.path.expanduser(value)
+
+
+def get_checklist_output() -> Optional[str]:
+    """ File the checklist printers write their report to, None for stdout """
+    value = os.environ.get(CHECKLIST_OUTPUT, "").strip()
+    if value == "":
+        return None
+    return os.path.expanduser(value)
+
+
+def get_xlsx_file() -> Optional[str]:
+    """ Workbook written by the xls checklist printer, None for the default InspexChecklist.xlsx """
+    value = os.environ.get(XLSX_FILE, "").strip()
+    if value == "":
+        return None
+    return os.path.expanduser(value)
+
+
+def get_csv_file() -> Optional[str]:
+    """ CSV file written by the printer of all the formats, None for the default InspexChecklist.csv """
+    value = os.environ.get(CSV_FILE, "").strip()
+    if value == "":
+        return None
+    return os.path.expanduser(value)
+
+
+def get_metrics_file() -> Optional[str]:
+    """ File the timings and counters of the detectors are written to, None to not record them """
+    value = os.environ.get(METRICS_FILE, "").strip()
+    if value == "":
+        return None
+    return os.path.expanduser(value)
+
+
+def get_profile_dir() -> Optional[str]:
+    """ Directory of the cProfile files of the detectors and printer phases, None to not profile """
+    value = os.environ.get(PROFILE_DIR, "").strip()
+    if value == "":
+        return None
+    return os.path.expanduser(value)
+
+
+def get_trace_memory() -> bool:
+    """ Whether the peak memory of the detectors is traced with tracemalloc, reported with INSPEX_METRICS_FILE """
+    return os.environ.get(TRACE_MEMORY, "").strip().lower() in ["1", "true", "yes"]
+
+
+def get_memory_budget() -> Optional[int]:
+    """ Contracts analyzed at once by the per-contract detectors, None to analyze them all at once """
+    value = os.environ.get(MEMORY_BUDGET, "").strip()
+    if value == "":
+        return None
+    return max(1, int(value))
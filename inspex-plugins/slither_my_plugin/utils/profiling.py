@@ -0,0 +1,116 @@
+import atexit
+import cProfile
+import os
+import pstats
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, List
+from slither_my_plugin.utils.plugin_config import get_profile_dir
+
+# Deeper stacks are cut, the time below them is lost from the collapsed stacks, not from the pstats files
+MAX_DEPTH = 64
+# Stack fragments smaller than this, in seconds, are not expanded further
+MIN_SHARE = 1e-6
+
+_profiles: Dict[str, cProfile.Profile] = {}
+# Only one profiler can be active, the enclosing one is paused while an inner one runs
+_stack: List[cProfile.Profile] = []
+_registered = False
+
+
+def profiling_enabled() -> bool:
+    return get_profile_dir() is not None
+
+
+@contextmanager
+def profiled(name: str):
+    """
+    Profile the block into the profile `name`, e.g. a detector ARGUMENT, when INSPEX_PROFILE_DIR is set.
+    The calls of a nested profiled block go to its own profile only.
+    """
+    if not profiling_enabled():
+        yield
+        return
+    global _registered
+    if not _registered:
+        _registered = True
+        atexit.register(write_profiles)
+    profile = _profiles.setdefault(name, cProfile.Profile())
+    if _stack:
+        _stack[-1].disable()
+    _stack.append(profile)
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        _stack.pop()
+        if _stack:
+            _stack[-1].enable()
+
+
+def reset_profiles():
+    """ Drop the profiles, for a forked worker which inherited the ones of the parent """
+    if _stack:
+        _stack[-1].disable()
+    _stack.clear()
+    _profiles.clear()
+
+
+def _label(func) -> str:
+    filename, line, name = func
+    if filename == "~": # Built-in
+        return name.replace(";", ",")
+    return ("%s (%s:%d)" % (name, os.path.basename(filename), line)).replace(";", ",")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """
+    Flame graph lines, `outer;inner;function microseconds`, with the time spent in the function itself.
+    cProfile only keeps the caller-callee pairs, so the stacks are rebuilt from them:
+    the time of a function is split between its callers in proportion of the time they spent calling it.
+    """
+    entries = stats.stats
+    callees = defaultdict(list)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, caller_stats in callers.items():
+            callees[caller].append((func, caller_stats[3]))
+    lines = Counter()
+
+    def visit(func, share: float, path: List[str], seen: set):
+        _, _, tt, ct, _ = entries[func]
+        ratio = share / ct if ct > 0 else 0
+        path = path + [_label(func)]
+        if tt * ratio > 0:
+            lines[";".join(path)] += tt * ratio
+        if len(path) >= MAX_DEPTH:
+            return
+        for callee, edge in callees.get(func, []):
+            # Recursion is folded into the first call
+            if callee in seen or callee not in entries or edge * ratio < MIN_SHARE:
+                continue
+            seen.add(callee)
+            visit(callee, edge * ratio, path, seen)
+            seen.discard(callee)
+
+    for func, (_, _, _, ct, callers) in entries.items():
+        if not callers:
+            visit(func, ct, [], {func})
+    return ["%s %d" % (stack, round(t * 1e6)) for stack, t in sorted(lines.items()) if round(t * 1e6) > 0]
+
+
+def write_profiles(suffix: str = ""):
+    """ `<name><suffix>.pstats` and `<name><suffix>.collapsed` in INSPEX_PROFILE_DIR for every profile """
+    directory = get_profile_dir()
+    if directory is None or not _profiles:
+        return
+    os.makedirs(directory, exist_ok=True)
+    for name, profile in _profiles.items():
+        path = os.path.join(directory, name + suffix)
+        profile.create_stats()
+        if not profile.stats:
+            continue
+        profile.dump_stats(path + ".pstats")
+        with open(path + ".collapsed", "w", encoding="utf8") as f:
+            for line in collapsed_stacks(pstats.Stats(profile)):
+                f.write(line + "\n")
@@ -0,0 +1,46 @@
+from typing import Callable, Dict, List, Optional
+from weakref import WeakKeyDictionary
+from slither.core.compilation_unit import SlitherCompilationUnit
+from slither.detectors.abstract_detector import AbstractDetector
+from slither_my_plugin.utils.instrumentation import record_cache, timed_detect
+from slither_my_plugin.utils.profiling import profiled
+
+
+_results: "WeakKeyDictionary[SlitherCompilationUnit, Dict[str, List[Dict]]]" = WeakKeyDictionary()
+
+
+def get_cached_results(compilation_unit: SlitherCompilationUnit, argument: str) -> Optional[List[Dict]]:
+    return _results.get(compilation_unit, {}).get(argument)
+
+
+def cache_results(compilation_unit: SlitherCompilationUnit, argument: str, results: List[Dict]):
+    if compilation_unit not in _results:
+        _results[compilation_unit] = {}
+    _results[compilation_unit][argument] = results
+
+
+def forget_results(compilation_unit: SlitherCompilationUnit, argument: str):
+    _results.get(compilation_unit, {}).pop(argument, None)
+
+
+def detect_with_cache(detector: AbstractDetector, detect: Optional[Callable[[], List[Dict]]] = None) -> List[Dict]:
+    """
+    Return the results of `detector.detect()`, running it at most once per compilation unit.
+    Slither only reports a result id once, so a second `detect()` of the same detector would come back empty.
+    The detector logger is muted while running; the caller decides whether to log the results.
+    """
+    results = get_cached_results(detector.compilation_unit, detector.ARGUMENT)
+    if results is not None:
+        record_cache(detector.ARGUMENT, "memory_hits")
+        return results
+    if detect is None:
+        detect = detector.detect
+    logger = detector.logger
+    detector.logger = None
+    try:
+        with profiled(detector.ARGUMENT):
+            results = timed_detect(detector, detect)()
+    finally:
+        detector.logger = logger
+    cache_results(detector.compilation_unit, detector.ARGUMENT, results)
+    return results
@@ -0,0 +1,24 @@
+import json
+from typing import Dict, List, Optional, Tuple
+
+FORMAT_VERSION = 1
+
+
+class SavedResults(dict):
+    """ Detector ARGUMENT -> results, as saved by the checklist printers """
+
+    def __missing__(self, argument):
+        raise KeyError("No saved results for '%s', save the results again with its section selected" % argument)
+
+
+def write_results_file(path: str, results: Dict[str, List[Dict]], sections: Optional[List[str]]):
+    with open(path, "w", encoding="utf8") as f:
+        json.dump({"version": FORMAT_VERSION, "sections": sections, "results": results}, f)
+
+
+def read_results_file(path: str) -> Tuple[SavedResults, Optional[List[str]]]:
+    with open(path, encoding="utf8") as f:
+        data = json.load(f)
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError("%s was not saved by this version of the plugin" % path)
+    return SavedResults(data["results"]), data["sections"]
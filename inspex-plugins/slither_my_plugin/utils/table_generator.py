@@ -1,21 +1,68 @@
-def markdownTableFromSlitherResult(table, cml, sortBy=None):
-    # print("# Summary Table of " + detector.ARGUMENT + "\n")
-    # print("## Target:")
-    res = ""
-    if len(table) <= 1:
-        return res
-    if sortBy is not None:
-        fTarget = table[0].index(sortBy)
-        if sortBy == "File":
-            try:
-                table = [table[0]] + sorted(table[1:], key=lambda x:(x[fTarget].split(" ")[0], int(x[fTarget].split("(L:")[1][:-1])))
-            except:
-                table = [table[0]] + sorted(table[1:], key=lambda x:x[fTarget])
-        else:
-            table = [table[0]] + sorted(table[1:], key=lambda x:x[fTarget])
-    for i, r in enumerate(table):
-        res += "|" + "|".join([(" %-"+str(cml[j])+"s ") % c for j,c in enumerate(r)]) + "|" + "\n"
-        if i==0:
-            res +=  "|" + "".join([ "-"*(c+2)+"|" for c in cml]) + "\n"
-    res += "\n"
-    return res
\ No newline at end of file
+import csv
+import io
+from typing import Callable, Dict, List, Optional
+
+
+class SourceLine:
+    """ File and line of a finding, rendered as `File.sol (L:12)` and sorted by file then line number """
+
+    __slots__ = ("filename", "line")
+
+    def __init__(self, filename: str, line: int):
+        self.filename = filename
+        self.line = line
+
+    def sortKey(self):
+        return (self.filename, self.line)
+
+    def __str__(self):
+        return "%s (L:%s)" % (self.filename, self.line)
+
+
+def _source_line(result: Dict, element: Dict) -> SourceLine:
+    mapping = element["source_mapping"]
+    return SourceLine(mapping["filename_short"].split("/")[-1], mapping["lines"][0])
+
+
+# Column -> value of the column for a detector result and its first element
+COLUMNS: Dict[str, Callable[[Dict, Dict], object]] = {
+    "File": _source_line,
+    "Contract": lambda result, element: element["type_specific_fields"]["parent"]["name"],
+    "Function": lambda result, element: element["name"] + "()",
+    "Modifier": lambda result, element: ", ".join(result["additional_fields"]["modifiers"]),
+    "Version": lambda result, element: element["name"],
+}
+
+
+def table_rows(results: List[Dict], header: List[str]) -> List[List]:
+    """ One row per result with elements, from its first element. The cells keep their type, e.g. SourceLine for File """
+    columns = [COLUMNS[h] for h in header]
+    return [[column(r, r["elements"][0]) for column in columns] for r in results if r["elements"]]
+
+
+def sort_rows(rows: List[List], header: List[str], sortBy: Optional[str]) -> List[List]:
+    if sortBy is None:
+        return rows
+    i = header.index(sortBy)
+    return sorted(rows, key=lambda row: row[i].sortKey() if isinstance(row[i], SourceLine) else row[i])
+
+
+def markdown_table(header: List[str], rows: List[List], sortBy: Optional[str] = None) -> str:
+    """ Columns padded to their widest cell, "" when there are no rows """
+    if not rows:
+        return ""
+    cells = [header] + [[str(c) for c in row] for row in sort_rows(rows, header, sortBy)]
+    widths = [max(len(row[j]) for row in cells) for j in range(len(header))]
+    lines = ["|" + "|".join(" %-*s " % (widths[j], c) for j, c in enumerate(row)) + "|" for row in cells]
+    lines.insert(1, "|" + "".join("-" * (w + 2) + "|" for w in widths))
+    return "\n".join(lines) + "\n\n"
+
+
+def csv_table(header: List[str], rows: List[List], sortBy: Optional[str] = None) -> str:
+    if not rows:
+        return ""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows([str(c) for c in row] for row in sort_rows(rows, header, sortBy))
+    return out.getvalue()
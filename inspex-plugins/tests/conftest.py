@@ -0,0 +1,42 @@
+import os
+import shutil
+import pytest
+from slither_my_plugin.utils import plugin_config
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture_path(name: str) -> str:
+    return os.path.join(FIXTURES, name)
+
+
+@pytest.fixture(autouse=True)
+def plugin_environment(monkeypatch):
+    """ The tests start without any INSPEX_* option, whatever the environment of the caller """
+    for name in dir(plugin_config):
+        value = getattr(plugin_config, name)
+        if name.isupper() and isinstance(value, str) and value.startswith("INSPEX_"):
+            monkeypatch.delenv(value, raising=False)
+
+
+@pytest.fixture
+def load_slither():
+    """
+    Slither of a fixture with the plugin detectors registered, all of them or the ARGUMENTs given.
+    The fixtures are Vyper contracts, they compile without downloading solc.
+    """
+    if shutil.which("vyper") is None:
+        pytest.skip("vyper is not installed")
+    from slither import Slither
+    from slither_my_plugin import make_plugin
+
+    def load(path: str, detectors=None):
+        slither = Slither(path)
+        for d in make_plugin()[0]:
+            if detectors is None or d.ARGUMENT in detectors:
+                slither.register_detector(d)
+        for d in slither.detectors:
+            d.logger = None
+        return slither
+
+    return load
@@ -0,0 +1,27 @@
+# @version ^0.3.10
+users: public(DynArray[address, 100])
+total: public(uint256)
+
+@external
+def nested(n: uint256):
+    for u in self.users:
+        if u == empty(address):
+            break
+        for j in range(3):
+            if j == 1:
+                continue
+            self.total += j
+
+@external
+def parameter(n: uint256):
+    for i in range(n, bound=10):
+        self.total += i
+
+@external
+def memory(values: DynArray[uint256, 10]):
+    for v in values:
+        self.total += v
+
+@external
+def flat():
+    self.total = 0
@@ -0,0 +1,56 @@
+# @version ^0.3.10
+interface IERC20:
+    def approve(spender: address, amount: uint256) -> bool: nonpayable
+    def balanceOf(a: address) -> uint256: view
+
+owner: public(address)
+fee: public(uint256)
+bal: public(HashMap[address, uint256])
+users: public(DynArray[address, 100])
+initialized: bool
+event Set:
+    v: uint256
+
+@internal
+def _log(v: uint256):
+    log Set(v)
+
+@external
+def transferOwnership(a: address):
+    assert msg.sender == self.owner
+    self.owner = a
+
+@external
+def setFee(f: uint256):
+    assert msg.sender == self.owner
+    self.fee = f
+
+@external
+def setFeeLogged(f: uint256):
+    assert msg.sender == self.owner
+    self.fee = f
+    self._log(f)
+
+@external
+def initialize():
+    self.owner = msg.sender
+
+@external
+def doApprove(t: IERC20, spender: address, amt: uint256):
+    t.approve(spender, amt)
+
+@external
+def check(t: IERC20) -> bool:
+    return t.balanceOf(self) == 100
+
+@external
+def loop(n: uint256):
+    for u in self.users:
+        if u == empty(address):
+            break
+        self.bal[u] = convert(convert(n, uint128), uint256)
+        assert n > 1
+        for j in range(3):
+            if j == 1:
+                continue
+            self.fee += j
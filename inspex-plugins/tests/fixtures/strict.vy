@@ -0,0 +1,41 @@
+# @version ^0.3.10
+interface IERC20:
+    def balanceOf(a: address) -> uint256: view
+
+snapshot: public(uint256)
+deadline: public(uint256)
+copied: uint256
+
+@external
+def record(t: IERC20):
+    self.snapshot = t.balanceOf(self)
+
+@external
+def reached() -> bool:
+    return self.snapshot == 10
+
+@external
+def copy():
+    self.copied = self.snapshot + 1
+
+@external
+def copiedReached() -> bool:
+    return self.copied == 11
+
+@external
+def direct() -> bool:
+    return self.balance == 10 ** 18
+
+@external
+def expired() -> bool:
+    return block.timestamp == self.deadline
+
+@external
+def local(t: IERC20) -> bool:
+    b: uint256 = t.balanceOf(msg.sender)
+    c: uint256 = b * 2
+    return c == 4
+
+@external
+def safe(x: uint256) -> bool:
+    return x == 3 and self.deadline == x
@@ -0,0 +1,142 @@
+import csv
+import io
+import logging
+import pytest
+from slither_my_plugin.utils.checklist_model import ItemStatus, build_checklist, finding_descriptions
+from slither_my_plugin.utils.output_sink import BufferSink
+from slither_my_plugin.utils.results_file import SavedResults
+from slither_my_plugin.printers.inspex_checklist import (
+    InspexTestingGuideChecklist,
+    InspexTestingGuideChecklistAll,
+    InspexTestingGuideChecklistCSV,
+    InspexTestingGuideChecklistXLS,
+)
+
+STANDARDS = [
+    ["1. Testing Something",
+    ["1.1\tFirst group",
+    ["1.1.1\tItem with findings", ["det-a"]],
+    ["1.1.2\tItem without detector", []],
+    ["1.1.3\tItem sharing a detector", ["det-b", "det-a"]]],
+    ["1.2\tSecond group",
+    ["1.2.1\tItem without findings", ["det-b"]]]],
+]
+
+DETECTOR_MAP = {
+    "det-a": [
+        {"description": "f() uses something:\n\t- x == 1 (A.sol#3)\n\t- y == 2 (A.sol#4)\n"},
+        {"description": "- g() (A.sol#10-12) is wrong\n"},
+    ],
+    "det-b": [],
+}
+
+
+def test_finding_descriptions_keep_the_lines_pointing_to_code():
+    result = {"description": "f() uses something:\n\t- x == 1 (A.sol#3)\n\n- g() (A.sol#10-12)\n"}
+    assert list(finding_descriptions(result)) == ["x == 1 (A.sol#3)", "g() (A.sol#10-12)"]
+
+
+def test_build_checklist():
+    checklist = build_checklist(STANDARDS, DETECTOR_MAP)
+    [section] = checklist.sections
+    assert (section.id, section.title) == ("1", "Testing Something")
+    items = list(section.items())
+    assert [i.id for i in items] == ["1.1.1", "1.1.2", "1.1.3", "1.2.1"]
+    assert [i.status for i in items] == [ItemStatus.FOUND, ItemStatus.UNSUPPORTED, ItemStatus.FOUND, ItemStatus.NO_ISSUE]
+    # The findings are numbered in the order of the checklist, a detector shared by two items counts twice
+    assert [f.idx for f in checklist.findings] == ["IDX-%d" % i for i in range(1, 7)]
+    assert [f.item.id for f in checklist.findings] == ["1.1.1"] * 3 + ["1.1.3"] * 3
+    assert checklist.findings[2].description == "g() (A.sol#10-12) is wrong"
+    # The findings, and the item to audit manually
+    assert section.count == 7
+
+
+class RecordingMap(dict):
+    def __init__(self, results, events):
+        super().__init__(results)
+        self.events = events
+
+    def __getitem__(self, argument):
+        self.events.append(("read", argument))
+        return super().__getitem__(argument)
+
+
+def test_results_are_released_after_their_last_item():
+    events = []
+    build_checklist(STANDARDS, RecordingMap(DETECTOR_MAP, events), lambda arg: events.append(("release", arg)))
+    assert events == [
+        ("read", "det-a"),
+        ("read", "det-b"),
+        ("read", "det-a"),
+        ("release", "det-a"),
+        ("read", "det-b"),
+        ("release", "det-b"),
+    ]
+
+
+def render(printer_class, results, sections):
+    sink = BufferSink()
+    printer_class.fromResults(SavedResults(results), sections, sink).output("")
+    return sink
+
+
+def contract_results(description):
+    return {
+        "erc20-interface": [{"description": description}],
+        "erc721-interface": [],
+        "common-standard-token": [],
+        "shadowing-builtin": [],
+        "shadowing-abstract": [],
+        "shadowing-state": [],
+    }
+
+
+def test_csv_fields_are_escaped():
+    description = '- Token.f(string,"a, b") (Token.sol#7)\n'
+    sink = render(InspexTestingGuideChecklistCSV, contract_results(description), ["2.1"])
+    rows = list(csv.reader(io.StringIO(sink.getvalue())))
+    assert rows[0] == InspexTestingGuideChecklistCSV.checklistHeader
+    issues = rows[rows.index(InspexTestingGuideChecklistCSV.issueHeader) + 1:]
+    assert issues == [["IDX-1", "2.1.1 Contract implementation should comply with the standards specification",
+                       'Token.f(string,"a, b") (Token.sol#7)', ""]]
+    # The issue column is always quoted, the quotes inside are doubled
+    assert sink.lines[-1] == 'IDX-1,2.1.1 Contract implementation should comply with the standards specification,' \
+        '"Token.f(string,""a, b"") (Token.sol#7)",'
+
+
+def test_text_and_csv_render_the_same_checklist():
+    results = contract_results("- Token (Token.sol#1-20) is not ERC20\n")
+    text = render(InspexTestingGuideChecklist, results, ["2.1"]).lines
+    assert "\t- [ ] (IDX-1) Token (Token.sol#1-20) is not ERC20" in text
+    assert "There are 1 issue(s) need too be addressed" in text
+    rows = list(csv.reader(io.StringIO(render(InspexTestingGuideChecklistCSV, results, ["2.1"]).getvalue())))
+    statuses = {r[0]: r[2] for r in rows if len(r) == 4 and r[0].count(".") == 2}
+    assert statuses == {"2.1.1": ItemStatus.FOUND.value, "2.1.2": ItemStatus.NO_ISSUE.value}
+
+
+def test_all_formats_write_their_files_and_log(tmp_path, monkeypatch, caplog):
+    monkeypatch.setenv("INSPEX_CSV_FILE", str(tmp_path / "checklist.csv"))
+    monkeypatch.setenv("INSPEX_XLSX_FILE", str(tmp_path / "checklist.xlsx"))
+    results = contract_results("- Token (Token.sol#1-20) is not ERC20\n")
+    sink = BufferSink()
+    printer = InspexTestingGuideChecklistAll.fromResults(SavedResults(results), ["2.1"], sink)
+    printer.logger = logging.getLogger("InspexChecklist")
+    with caplog.at_level(logging.INFO, "InspexChecklist"):
+        printer.output("")
+    rows = list(csv.reader(io.StringIO((tmp_path / "checklist.csv").read_text(encoding="utf8"))))
+    assert rows[0] == InspexTestingGuideChecklistCSV.checklistHeader
+    # The messages are logged, the text report only holds the checklist
+    assert not any("has been created" in line for line in sink.lines)
+    assert any(str(tmp_path / "checklist.csv") in m for m in caplog.messages)
+    if (tmp_path / "checklist.xlsx").exists():
+        assert any(str(tmp_path / "checklist.xlsx") in m for m in caplog.messages)
+
+
+def test_the_workbook_printer_opens_no_sink(tmp_path):
+    pytest.importorskip("xlsxwriter")
+    results = contract_results("- Token (Token.sol#1-20) is not ERC20\n")
+    printer = InspexTestingGuideChecklistXLS.fromResults(SavedResults(results), ["2.1"])
+    printer.workbookFile = str(tmp_path / "checklist.xlsx")
+    printer.output("")
+    assert printer.sink is None
+    assert (tmp_path / "checklist.xlsx").stat().st_size > 0
@@ -0,0 +1,130 @@
+import os
+import shutil
+from slither.core.compilation_unit import SlitherCompilationUnit
+from conftest import fixture_path
+
+NEW_LOOP = """
+@external
+def refill(values: DynArray[uint256, 10]):
+    for v in values:
+        self.total = v
+"""
+
+
+def cached_run(load_slither, path, argument, prepare=None):
+    """ Results of the detector on a new Slither of `path`, and how many times _detect() ran """
+    slither = load_slither(path, [argument])
+    if prepare is not None:
+        prepare(slither)
+    [detector] = slither.detectors
+    calls = []
+    detect = detector._detect
+
+    def counted():
+        calls.append(1)
+        return detect()
+
+    detector._detect = counted
+    return detector.detect(), len(calls)
+
+
+def test_results_are_reused_until_the_file_changes(load_slither, tmp_path, monkeypatch):
+    monkeypatch.setenv("INSPEX_CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "loops.vy")
+    shutil.copy(fixture_path("loops.vy"), path)
+
+    first, calls = cached_run(load_slither, path, "state-changing-loop")
+    assert calls == 1 and len(first) == 1
+    assert os.listdir(tmp_path / "cache" / "state-changing-loop")
+
+    again, calls = cached_run(load_slither, path, "state-changing-loop")
+    assert calls == 0
+    assert again == first
+
+    with open(path, "a", encoding="utf8") as f:
+        f.write(NEW_LOOP)
+    changed, calls = cached_run(load_slither, path, "state-changing-loop")
+    assert calls == 1
+    assert "refill" in changed[0]["description"] and "refill" not in first[0]["description"]
+
+
+def test_whole_unit_detectors_are_invalidated_too(load_slither, tmp_path, monkeypatch):
+    monkeypatch.setenv("INSPEX_CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "loops.vy")
+    shutil.copy(fixture_path("loops.vy"), path)
+
+    first, calls = cached_run(load_slither, path, "floating-pragma-version")
+    assert calls == 1
+    again, calls = cached_run(load_slither, path, "floating-pragma-version")
+    assert calls == 0 and again == first
+
+    # Only a comment changes, the lines of the results may have moved so nothing is reused
+    with open(path, "a", encoding="utf8") as f:
+        f.write("\n# Trailing comment\n")
+    _, calls = cached_run(load_slither, path, "floating-pragma-version")
+    assert calls == 1
+
+
+def test_nothing_is_stored_without_a_cache_dir(load_slither, tmp_path):
+    path = str(tmp_path / "loops.vy")
+    shutil.copy(fixture_path("loops.vy"), path)
+    for _ in range(2):
+        _, calls = cached_run(load_slither, path, "state-changing-loop")
+        assert calls == 1
+
+
+def test_a_new_plugin_version_invalidates(load_slither, tmp_path, monkeypatch):
+    from slither_my_plugin.utils import disk_cache
+    monkeypatch.setenv("INSPEX_CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "loops.vy")
+    shutil.copy(fixture_path("loops.vy"), path)
+
+    cached_run(load_slither, path, "state-changing-loop")
+    monkeypatch.setattr(disk_cache, "_plugin_version", "another version")
+    _, calls = cached_run(load_slither, path, "state-changing-loop")
+    assert calls == 1
+
+
+class Child:
+    """ Stands for a contract of another file inheriting from the fixture, Vyper has no inheritance """
+
+    name = "Child"
+
+
+def add_child(slither):
+    unit = slither.compilation_units[0]
+    [parent] = unit.contracts
+    unit._derived_contracts_map = {parent: [Child()]}
+
+
+def test_a_new_child_contract_invalidates(load_slither, tmp_path, monkeypatch):
+    monkeypatch.setenv("INSPEX_CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "loops.vy")
+    shutil.copy(fixture_path("loops.vy"), path)
+    # As Slither does with a real child, the inherited contract is not analyzed
+    monkeypatch.setattr(
+        SlitherCompilationUnit, "contracts_derived",
+        property(lambda unit: [c for c in unit.contracts if not c.derived_contracts]),
+    )
+
+    first, _ = cached_run(load_slither, path, "state-changing-loop")
+    assert len(first) == 1
+    leaf, calls = cached_run(load_slither, path, "state-changing-loop", add_child)
+    assert calls == 1 and leaf == []
+
+
+def test_files_without_contracts_are_hashed(load_slither, tmp_path, monkeypatch):
+    monkeypatch.setenv("INSPEX_CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "loops.vy")
+    shutil.copy(fixture_path("loops.vy"), path)
+
+    def with_constants(pragma):
+        def prepare(slither):
+            slither.source_code[str(tmp_path / "constants.vy")] = "# %s\nFEE: constant(uint256) = 10\n" % pragma
+        return prepare
+
+    cached_run(load_slither, path, "floating-pragma-version", with_constants("@version ^0.3.10"))
+    _, calls = cached_run(load_slither, path, "floating-pragma-version", with_constants("@version ^0.3.10"))
+    assert calls == 0
+    _, calls = cached_run(load_slither, path, "floating-pragma-version", with_constants("@version 0.3.10"))
+    assert calls == 1
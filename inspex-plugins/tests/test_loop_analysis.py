@@ -0,0 +1,70 @@
+import re
+from slither.core.cfg.node import NodeType
+from slither_my_plugin.utils.loop_analysis import LoopBound, get_loop_forest, loop_bound_fields
+from conftest import fixture_path
+
+
+def functions_of(slither):
+    return {f.name: f for c in slither.contracts for f in c.functions}
+
+
+def test_nested_loops(load_slither):
+    functions = functions_of(load_slither(fixture_path("loops.vy"), []))
+    forest = get_loop_forest(functions["nested"])
+    assert len(forest.loops) == 2
+    outer, inner = forest.loops
+    assert forest.roots == [outer]
+    assert outer.children == [inner] and inner.parent is outer
+    assert (outer.depth, inner.depth) == (1, 2)
+    # The inner loop is part of the outer body, its nodes belong to the innermost loop
+    assert inner.start in outer and inner.body < outer.body
+    for node in inner.body:
+        assert forest.loop_of(node) is inner
+    for node in outer.body - inner.body - {inner.start, inner.end}:
+        assert forest.loop_of(node) is outer
+    assert outer.header.type == NodeType.IFLOOP and forest.loop_of(outer.header) is outer
+    assert inner.header.type == NodeType.IFLOOP and forest.loop_of(inner.header) is inner
+    # The break leaves the outer loop, the continue stays in the inner one
+    assert any(n.type == NodeType.BREAK for n in outer.exits)
+    assert not any(n.type == NodeType.CONTINUE for n in inner.exits)
+    assert forest.loop_of(functions["nested"].entry_point) is None
+
+
+def test_function_without_loops(load_slither):
+    functions = functions_of(load_slither(fixture_path("loops.vy"), []))
+    forest = get_loop_forest(functions["flat"])
+    assert forest.loops == [] and forest.roots == [] and forest.loop_nodes == set()
+    assert get_loop_forest(functions["flat"]) is forest
+
+
+def test_loop_bounds(load_slither):
+    functions = functions_of(load_slither(fixture_path("loops.vy"), []))
+    bounds = {name: [l.bound for l in get_loop_forest(functions[name]).loops] for name in ["nested", "parameter", "memory"]}
+    assert bounds == {
+        "nested": [LoopBound.STORAGE_ARRAY_LENGTH, LoopBound.CONSTANT],
+        "parameter": [LoopBound.PARAMETER],
+        "memory": [LoopBound.MEMORY_ARRAY_LENGTH],
+    }
+
+
+def test_loop_bound_fields(load_slither):
+    functions = functions_of(load_slither(fixture_path("loops.vy"), []))
+    nested = functions["nested"]
+    fields = loop_bound_fields(get_loop_forest(nested).loops)
+    assert [(b["function"], b["bound"]) for b in fields["loop_bounds"]] == [
+        (nested.canonical_name, "storage array length"),
+        (nested.canonical_name, "constant"),
+    ]
+    assert fields["loop_bounds"][1]["lines"][0] == 10
+
+
+def test_loop_detectors_report_the_dynarray_loops(load_slither):
+    slither = load_slither(fixture_path("loops.vy"), ["state-changing-loop", "loop-skip"])
+    results = {d.ARGUMENT: d.detect() for d in slither.detectors}
+    # Loops over a DynArray grow with the data, the loop bounded by a parameter does not
+    [changing] = results["state-changing-loop"]
+    bounds = [(b["function"].split(".")[-1], b["bound"]) for b in changing["additional_fields"]["loop_bounds"]]
+    assert bounds == [("nested()", "storage array length"), ("memory()", "memory array length")]
+    [skip] = results["loop-skip"]
+    assert re.search(r"BREAK \(\S*loops\.vy#9\)", skip["description"])
+    assert re.search(r"CONTINUE \(\S*loops\.vy#12\)", skip["description"])
@@ -0,0 +1,71 @@
+import pytest
+from slither_my_plugin.detectors.extends.cached_detector import CachedDetector
+from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.printers.inspex_checklist import InspexTestingGuideChecklist
+from slither_my_plugin.utils.parallel import can_fork
+from slither_my_plugin.utils.result_cache import get_cached_results
+from conftest import fixture_path
+
+SETTINGS = {
+    "jobs": {"INSPEX_JOBS": "2"},
+    "budget": {"INSPEX_MEMORY_BUDGET": "1"},
+    "jobs and budget": {"INSPEX_JOBS": "2", "INSPEX_MEMORY_BUDGET": "1"},
+}
+
+
+def plugin_results(slither):
+    return {d.ARGUMENT: d.detect() for d in slither.detectors if isinstance(d, CachedDetector)}
+
+
+def summary_tables(slither):
+    return {d.ARGUMENT: d.toTable() for d in slither.detectors if hasattr(d, "toTable")}
+
+
+@pytest.mark.parametrize("setting", list(SETTINGS))
+def test_results_do_not_depend_on_the_run(load_slither, monkeypatch, setting):
+    if "INSPEX_JOBS" in SETTINGS[setting] and not can_fork():
+        pytest.skip("the parallel run needs fork")
+    serial = plugin_results(load_slither(fixture_path("sample.vy")))
+    for name, value in SETTINGS[setting].items():
+        monkeypatch.setenv(name, value)
+    slither = load_slither(fixture_path("sample.vy"))
+    # The interface is a contract too, the PER_CONTRACT detectors are split into two shards
+    assert len(slither.compilation_units[0].contracts) == 2
+    results = plugin_results(slither)
+    assert any(results.values())
+    assert list(results) == list(serial)
+    for argument, expected in serial.items():
+        assert results[argument] == expected, argument
+
+
+def test_summary_tables_after_a_checklist_with_a_budget(load_slither, monkeypatch, tmp_path):
+    expected = summary_tables(load_slither(fixture_path("sample.vy")))
+    assert any(expected.values())
+    monkeypatch.setenv("INSPEX_MEMORY_BUDGET", "1")
+    monkeypatch.setenv("INSPEX_CHECKLIST_OUTPUT", str(tmp_path / "checklist.md"))
+    slither = load_slither(fixture_path("sample.vy"))
+    printer = InspexTestingGuideChecklist(slither.compilation_units[0], slither, None)
+    printer.output("")
+    assert (tmp_path / "checklist.md").read_text(encoding="utf8")
+    # The cached results lose their elements, the tables were built before
+    unit = slither.compilation_units[0]
+    checklist = printer.checklistArguments()
+    cached = [
+        get_cached_results(unit, d.ARGUMENT)
+        for d in slither.detectors if isinstance(d, SummaryTable) and d.ARGUMENT in checklist
+    ]
+    assert any(cached) and not any("elements" in r for results in cached for r in results)
+    assert summary_tables(slither) == expected
+
+
+def test_the_disk_cache_keeps_the_budget(load_slither, monkeypatch, tmp_path):
+    monkeypatch.setenv("INSPEX_MEMORY_BUDGET", "1")
+    monkeypatch.setenv("INSPEX_CACHE_DIR", str(tmp_path / "cache"))
+    slither = load_slither(fixture_path("sample.vy"))
+    shards = []
+    for d in slither.detectors:
+        if isinstance(d, CachedDetector) and d.PER_CONTRACT:
+            detect = d._detect
+            d._detect = lambda d=d, detect=detect: shards.append(d.contractShard) or detect()
+    plugin_results(slither)
+    assert shards and all(len(s) == 1 for s in shards)
@@ -0,0 +1,84 @@
+from itertools import combinations
+from slither.analyses.data_dependency.data_dependency import KEY_SSA, is_dependent_ssa
+from slither_my_plugin.detectors.strict_equalities import StrictEqualities
+from conftest import fixture_path
+
+
+def detector_of(slither) -> StrictEqualities:
+    return next(d for d in slither.detectors if isinstance(d, StrictEqualities))
+
+
+def contract_taints(detector, contract):
+    funcs = contract.all_functions_called + contract.modifiers
+    return detector.taint_balance_equalities(funcs) + detector.sources_taint
+
+
+def test_tainted_variables_match_is_dependent_ssa(load_slither):
+    slither = load_slither(fixture_path("strict.vy"), ["strict-equalities"])
+    detector = detector_of(slither)
+    checked = 0
+    for contract in slither.contracts_derived:
+        taints = contract_taints(detector, contract)
+        variables = list(contract.context[KEY_SSA])
+        # Every taint alone, every pair, and all of them
+        subsets = [[t] for t in taints] + [list(p) for p in combinations(taints, 2)] + [taints]
+        for subset in subsets:
+            tainted = StrictEqualities.tainted_variables(contract, subset)
+            for var in variables:
+                expected = any(is_dependent_ssa(var, t, contract) for t in subset)
+                assert (var in tainted) == expected, (contract.name, var, subset)
+                checked += 1
+    assert checked > 0
+
+
+def reference_nodes(detector, contract):
+    """ The tainted comparisons as the detector found them before its caches, one is_dependent_ssa per pair """
+    funcs = contract.all_functions_called + contract.modifiers
+    taints = contract_taints(detector, contract)
+    found = set()
+    for func in funcs:
+        for node in func.nodes:
+            for ir in node.irs_ssa:
+                if detector.is_direct_comparison(ir) and any(
+                    is_dependent_ssa(var, taint, func.contract) for var in ir.used for taint in taints
+                ):
+                    found.add((func.name, node.node_id))
+    return found
+
+
+def detector_results(detector, contract):
+    detector._detect() # Sets up the caches of the run
+    return detector.detect_strict_equality(contract)
+
+
+def test_results_match_the_uncached_search(load_slither):
+    slither = load_slither(fixture_path("strict.vy"), ["strict-equalities"])
+    detector = detector_of(slither)
+    expected = set()
+    for contract in slither.contracts_derived:
+        expected |= reference_nodes(detector, contract)
+    found = set()
+    for contract in slither.contracts_derived:
+        for func, nodes in detector_results(detector, contract).items():
+            found |= {(func.name, node.node_id) for node in nodes}
+    assert found == expected
+    assert {name for name, _ in found} == {"reached", "copiedReached", "expired", "local"}
+
+
+def test_function_results_are_reused(load_slither, monkeypatch):
+    slither = load_slither(fixture_path("strict.vy"), ["strict-equalities"])
+    detector = detector_of(slither)
+    calls = []
+    tainted_variables = StrictEqualities.tainted_variables
+    monkeypatch.setattr(
+        StrictEqualities, "tainted_variables", staticmethod(lambda c, t: calls.append(c) or tainted_variables(c, t))
+    )
+    contract = next(c for c in slither.contracts_derived if c.name == "strict")
+    detector._detect()
+    computed = len(calls)
+    first = {f: list(n) for f, n in detector.detect_strict_equality(contract).items()}
+    # Reached again with the same taints, as a library function is from a second contract
+    assert len(calls) == computed
+    assert detector.detect_strict_equality(contract) == first
+    # One entry per function with a comparison, the copies of a contract are not merged
+    assert len(detector._function_results) == sum(1 for f in contract.functions if detector.comparison_operands(f))
@@ -0,0 +1,80 @@
+from slither_my_plugin.detectors.extends.summary_table import SummaryTable
+from slither_my_plugin.utils.result_cache import cache_results
+
+
+class CompilationUnit:
+    """ Stands for the compilation unit keying the result cache """
+
+
+class Table(SummaryTable):
+    ARGUMENT = "table"
+
+    def __init__(self, results, sort="File"):
+        self.compilation_unit = CompilationUnit()
+        self.TABLE_SORT = sort
+        # Already cached, as after the detector ran
+        cache_results(self.compilation_unit, self.ARGUMENT, results)
+
+
+def element(filename, line, contract, function):
+    return {
+        "name": function,
+        "source_mapping": {"filename_short": "contracts/" + filename, "lines": [line, line + 1]},
+        "type_specific_fields": {"parent": {"name": contract}},
+    }
+
+
+def result(*elements):
+    return {"elements": list(elements)}
+
+
+RESULTS = [
+    result(element("B.sol", 3, "B", "b"), element("A.sol", 1, "A", "other")),
+    result(element("A.sol", 10, "A", "ten")),
+    result(element("A.sol", 9, "A", "nine")),
+    result(),
+]
+
+
+def test_one_row_per_result_from_its_first_element():
+    rows = Table(RESULTS).tableRows()
+    assert [[str(c) for c in row] for row in rows] == [
+        ["B.sol (L:3)", "B", "b()"],
+        ["A.sol (L:10)", "A", "ten()"],
+        ["A.sol (L:9)", "A", "nine()"],
+    ]
+
+
+def test_markdown_table():
+    assert Table(RESULTS).toTable() == (
+        "| File         | Contract | Function |\n"
+        "|--------------|----------|----------|\n"
+        "| A.sol (L:9)  | A        | nine()   |\n"
+        "| A.sol (L:10) | A        | ten()    |\n"
+        "| B.sol (L:3)  | B        | b()      |\n"
+        "\n"
+    )
+
+
+def test_csv_table():
+    assert Table(RESULTS).toCsv() == (
+        "File,Contract,Function\n"
+        "A.sol (L:9),A,nine()\n"
+        "A.sol (L:10),A,ten()\n"
+        "B.sol (L:3),B,b()\n"
+    )
+
+
+def test_rows_keep_the_order_of_the_results_without_sort():
+    table = Table(RESULTS, sort=None).toTable()
+    assert [line.split("|")[3].strip() for line in table.splitlines()[2:-1]] == ["b()", "ten()", "nine()"]
+
+
+def test_no_table_without_rows():
+    assert Table([]).toTable() == "" and Table([result()]).toCsv() == ""
+
+
+def test_malformed_result():
+    malformed = [result({"name": "f", "source_mapping": {"filename_short": "A.sol", "lines": []}})]
+    assert Table(malformed).toTable() == ""
+    assert Table(malformed).toCsv() == ""